@@ -2,6 +2,7 @@
 连接管理器
 负责串口连接的建立、维护和断开
 """
+import logging
 import serial
 import time
 from typing import Optional
@@ -11,21 +12,57 @@ from ..utils.config import config_manager
 from ..utils.serial_data_logger import serial_data_logger_manager
 
 
+# 模块级日志记录器，所有实例共享同一个绑定，避免每次实例化重复创建
+_logger = get_logger("connection_manager")
+
+
 class ConnectionManager:
     """串口连接管理器，负责串口连接的建立、维护和断开"""
 
+    # 长期存在的单例，属性集合固定，使用__slots__省去实例__dict__
+    __slots__ = ('logger', 'config', 'serial_port', '_is_connected', 'current_port',
+                 '_rx_pending', '_debug', '_serial_defaults', '_com_log_enabled')
+
     def __init__(self):
         """初始化连接管理器"""
-        self.logger = get_logger("connection_manager")
+        self.logger = _logger
         self.config = config_manager.get_config()
         self.serial_port: Optional[serial.Serial] = None
         self._is_connected = False
         self.current_port = None  # 当前连接的端口名称
+        # 连接时确定是否记录通信日志，避免每次写入都读取配置
+        self._com_log_enabled = False
+        # read_until按块读取时结束符之后多读到的数据，供后续读取使用
+        self._rx_pending = bytearray()
+        # 缓存DEBUG级别是否启用，避免在收发热路径上为被禁用的日志生成十六进制字符串
+        self._debug = logging.getLogger("connection_manager").isEnabledFor(logging.DEBUG)
+        # 连接时除端口和波特率外的串口参数，在初始化时从配置中固定下来
+        self._serial_defaults = self._build_serial_defaults()
 
     def initialize(self) -> None:
         """初始化连接管理器"""
+        self._debug = logging.getLogger("connection_manager").isEnabledFor(logging.DEBUG)
+        self._serial_defaults = self._build_serial_defaults()
         self.logger.info("连接管理器初始化完成")
 
+    def _build_serial_defaults(self) -> dict:
+        """
+        从配置构建串口默认参数
+
+        Returns:
+            传给serial.Serial的关键字参数字典
+        """
+        c = self.config.serial
+        return {
+            'bytesize': c.bytesize,
+            'parity': c.parity,
+            'stopbits': c.stopbits,
+            'timeout': c.timeout,
+            'xonxoff': c.xonxoff,
+            'rtscts': c.rtscts,
+            'dsrdtr': c.dsrdtr
+        }
+
     def connect(self, port: str, baudrate: int = None) -> None:
         """
         连接串口
@@ -43,21 +80,13 @@ class ConnectionManager:
             if baudrate is None:
                 baudrate = self.config.serial.baudrate
 
-            # 使用配置中的其他参数
-            self.serial_port = serial.Serial(
-                port=port,
-                baudrate=baudrate,
-                bytesize=self.config.serial.bytesize,
-                parity=self.config.serial.parity,
-                stopbits=self.config.serial.stopbits,
-                timeout=self.config.serial.timeout,
-                xonxoff=self.config.serial.xonxoff,
-                rtscts=self.config.serial.rtscts,
-                dsrdtr=self.config.serial.dsrdtr
-            )
+            # 使用初始化时缓存的其他参数
+            self.serial_port = serial.Serial(port=port, baudrate=baudrate, **self._serial_defaults)
 
             self._is_connected = True
             self.current_port = port  # 记录当前连接的端口
+            self._com_log_enabled = bool(self.config.logging.com_log_enabled)
+            self._rx_pending = bytearray()
             self.logger.info(f"串口连接成功: {port}@{baudrate}")
 
         except serial.SerialException as e:
@@ -82,31 +111,54 @@ class ConnectionManager:
                 self.current_port = None
             finally:
                 self.serial_port = None
+                self._com_log_enabled = False
+                self._rx_pending = bytearray()
         else:
             self.logger.warning("尝试断开未连接的串口")
+            # 端口可能已被意外关闭，保持连接状态标志一致
+            self._is_connected = False
+            self.serial_port = None
+            self.current_port = None
+            self._com_log_enabled = False
+
+    def set_com_log_enabled(self, enabled: bool) -> None:
+        """
+        运行时开关当前连接的通信日志记录
 
-    def write(self, data: bytes) -> int:
+        Args:
+            enabled: 是否记录发送数据到通信日志，未连接时忽略
+        """
+        self._com_log_enabled = bool(enabled) and self.current_port is not None
+
+    def write(self, data: bytes, *, drain: bool = False) -> int:
         """
         向串口写入数据
 
+        默认只把数据交给驱动缓冲区即返回，不等待发送完成；
+        需要确认数据已完全发出(如发送后立即等待响应)时传入drain=True。
+
         Args:
             data: 要写入的字节数据
+            drain: 是否阻塞等待输出缓冲区数据全部发出
 
         Returns:
             实际写入的字节数
         """
-        if not self._is_connected or not self.serial_port or not self.serial_port.is_open:
+        # _is_connected 只在 connect/disconnect 中维护，端口被意外关闭时由pyserial抛出异常
+        if not self._is_connected:
             raise SerialConnectionError("串口未连接")
 
         try:
             bytes_written = self.serial_port.write(data)
-            self.serial_port.flush()  # 确保数据被发送
+            if drain:
+                self.serial_port.flush()  # 等待数据全部发出
 
             # 记录发送的数据到通信日志
-            if self.current_port and self.config.logging.com_log_enabled:
+            if self._com_log_enabled:
                 serial_data_logger_manager.log_data(self.current_port, 'TX', data)
 
-            self.logger.debug(f"写入 {bytes_written} 字节数据: {data.hex()}")
+            if self._debug:
+                self.logger.debug(f"写入 {bytes_written} 字节数据: {data.hex()}")
             return bytes_written
         except serial.SerialException as e:
             self.logger.error(f"写入串口数据失败: {e}")
@@ -125,12 +177,52 @@ class ConnectionManager:
         Returns:
             读取到的字节数据
         """
-        if not self._is_connected or not self.serial_port or not self.serial_port.is_open:
+        if not self._is_connected:
             raise SerialConnectionError("串口未连接")
 
         try:
-            data = self.serial_port.read(size)
-            if data:
+            if self._rx_pending:
+                # 优先返回read_until多读的数据
+                data = bytes(self._rx_pending[:size])
+                del self._rx_pending[:size]
+            else:
+                data = self.serial_port.read(size)
+            if data and self._debug:
+                self.logger.debug(f"读取 {len(data)} 字节数据: {data.hex()}")
+            return data
+        except serial.SerialException as e:
+            self.logger.error(f"读取串口数据失败: {e}")
+            raise SerialConnectionError(f"读取串口数据失败: {e}")
+        except Exception as e:
+            self.logger.error(f"读取数据时发生未知错误: {e}")
+            raise SerialConnectionError(f"读取数据时发生未知错误: {e}")
+
+    def read_available(self, max_size: int = 4096, block: bool = True) -> bytes:
+        """
+        一次性读取串口缓冲区中所有可用数据
+
+        Args:
+            max_size: 单次最多读取的字节数
+            block: 无可用数据时是否按串口超时阻塞等待1个字节，False时直接返回空字节
+
+        Returns:
+            读取到的字节数据
+        """
+        if not self._is_connected:
+            raise SerialConnectionError("串口未连接")
+
+        if self._rx_pending:
+            return self.read(max_size)
+
+        try:
+            n = self.serial_port.in_waiting
+            if n:
+                data = self.serial_port.read(min(n, max_size))
+            elif block:
+                data = self.serial_port.read(1)
+            else:
+                return b''
+            if data and self._debug:
                 self.logger.debug(f"读取 {len(data)} 字节数据: {data.hex()}")
             return data
         except serial.SerialException as e:
@@ -151,12 +243,12 @@ class ConnectionManager:
         Returns:
             读取到的字节数据
         """
-        if not self._is_connected or not self.serial_port or not self.serial_port.is_open:
+        if not self._is_connected:
             raise SerialConnectionError("串口未连接")
 
         try:
-            data = self.serial_port.read_until(expected, size)
-            if data:
+            data = self._read_until_chunked(expected, size)
+            if data and self._debug:
                 self.logger.debug(f"读取直到 {expected}，获得 {len(data)} 字节数据: {data.hex()}")
             return data
         except serial.SerialException as e:
@@ -166,8 +258,56 @@ class ConnectionManager:
             self.logger.error(f"读取数据时发生未知错误: {e}")
             raise SerialConnectionError(f"读取数据时发生未知错误: {e}")
 
+    def _read_until_chunked(self, expected: bytes, size: Optional[int]) -> bytes:
+        """
+        按块读取直到遇到预期字节序列、达到最大字节数或超时
+
+        pyserial的read_until逐字节调用read(1)，这里每次读取in_waiting个字节，
+        结束符之后多读的数据保存在_rx_pending中
+
+        Args:
+            expected: 期望遇到的字节序列
+            size: 最大读取字节数
+
+        Returns:
+            读取到的字节数据
+        """
+        port = self.serial_port
+        buf = self._rx_pending
+        self._rx_pending = bytearray()
+        expected_len = len(expected)
+        timeout = port.timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        search_from = 0
+        expired = False
+
+        while True:
+            idx = buf.find(expected, search_from)
+            if idx != -1:
+                end = idx + expected_len
+                if size is not None:
+                    end = min(end, size)
+                break
+            if size is not None and len(buf) >= size:
+                end = size
+                break
+            if expired:
+                end = len(buf)
+                break
+
+            # 结束符可能跨越两次读取，从末尾重叠部分继续查找
+            search_from = max(0, len(buf) - expected_len + 1)
+            chunk = port.read(port.in_waiting or 1)
+            if chunk:
+                buf.extend(chunk)
+            expired = deadline is not None and time.monotonic() >= deadline
+
+        self._rx_pending = buf[end:]
+        return bytes(buf[:end])
+
     def flush_input(self) -> None:
         """清空输入缓冲区"""
+        self._rx_pending = bytearray()
         if self.serial_port and self.serial_port.is_open:
             try:
                 self.serial_port.reset_input_buffer()
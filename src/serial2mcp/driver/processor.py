@@ -4,12 +4,107 @@
 """
 import re
 import time
-from typing import Union, Dict, Any, List, Optional
+from typing import Union, List, NamedTuple, Optional
 from ..utils.logger import get_logger
 from ..utils.exceptions import DataParsingError
 from ..utils.config import config_manager
 from ..utils.metrics import metrics_collector
 
+try:
+    from fastcrc import crc16 as _fastcrc16
+except ImportError:  # fastcrc 为可选依赖
+    _fastcrc16 = None
+
+
+def _build_crc16_tables() -> List[List[int]]:
+    """
+    生成CRC16（反向多项式0xA001）的slice-by-8查找表
+
+    tables[0][b] 为单字节的CRC值，tables[k][b] 为该字节之后再经过k个零字节的CRC值
+
+    Returns:
+        8张256项查找表
+    """
+    t0 = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 0x0001 else crc >> 1  # CRC16-IBM 多项式反向表示
+        t0.append(crc)
+
+    tables = [t0]
+    for _ in range(7):
+        prev = tables[-1]
+        tables.append([(prev[i] >> 8) ^ t0[prev[i] & 0xFF] for i in range(256)])
+    return tables
+
+
+_CRC16_TABLES = _build_crc16_tables()
+
+
+def _crc16_py(data: bytes) -> int:
+    """
+    纯Python实现的CRC16（CRC-16/MODBUS：初值0xFFFF，反向多项式0xA001）
+
+    采用slice-by-8查表法，每次处理8个字节，剩余字节逐字节查表
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = _CRC16_TABLES
+    crc = 0xFFFF
+    tail = len(data) & 7
+    it = iter(data[:len(data) - tail])
+    for b0, b1, b2, b3, b4, b5, b6, b7 in zip(it, it, it, it, it, it, it, it):
+        crc ^= b0 | (b1 << 8)
+        crc = (t7[crc & 0xFF] ^ t6[crc >> 8] ^ t5[b2] ^ t4[b3] ^
+               t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+    if tail:
+        for byte in data[-tail:]:
+            crc = (crc >> 8) ^ t0[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _crc16(data: bytes) -> str:
+    """计算CRC16校验和，安装了fastcrc时使用其原生实现"""
+    crc = _fastcrc16.modbus(bytes(data)) if _fastcrc16 is not None else _crc16_py(data)
+    return f"{crc:04X}"
+
+
+def _xor_checksum(data: bytes) -> str:
+    """计算异或校验和：将整段数据视为大整数，按字节对半折叠异或"""
+    n = len(data)
+    if not n:
+        return "00"
+    value = int.from_bytes(data, 'little')
+    # 补齐到2的幂字节数后逐次对半折叠，循环次数为log2(n)
+    half = 1 << ((n - 1).bit_length() - 1) if n > 1 else 0
+    while half:
+        bits = half * 8
+        value = (value >> bits) ^ (value & ((1 << bits) - 1))
+        half >>= 1
+    return f"{value:02X}"
+
+
+# ASCII范围内的不可打印字节（\t、\n、\r 视为可打印），供 bytes.translate 删除计数
+_ASCII_NON_PRINTABLE = bytes(b for b in range(128) if not (chr(b).isprintable() or chr(b) in '\n\r\t'))
+
+# 十六进制数字字符，供 bytes.translate 删除计数
+_HEX_DIGITS = b'0123456789abcdefABCDEF'
+
+# 校验算法 -> 计算函数
+_CHECKSUM_FUNCS = {
+    'crc16': _crc16,
+    'xor': _xor_checksum,
+}
+
+
+class RxResult(NamedTuple):
+    """接收数据处理结果"""
+    raw_data: bytes
+    decoded_data: Optional[str]
+    is_hex: bool
+    encoding: Optional[str]
+    length: int
+    timestamp: float
+
 
 class DataProcessor:
     """数据处理器，负责对接收到的数据进行解析、格式化和编码转换"""
@@ -24,6 +119,11 @@ class DataProcessor:
             'whitespace': re.compile(r'\s+'),
             'hex_pattern': re.compile(r'^[0-9a-fA-F\s]+$'),
             'at_command_response': re.compile(r'^(OK|ERROR|FAIL|\+[^:]+:|C[MEGS][0-9]+:)', re.IGNORECASE),
+            # 字节版本，直接在原始数据上匹配，无需先解码
+            'at_command_response_b': re.compile(rb'^(OK|ERROR|FAIL|\+[^:]+:|C[MEGS][0-9]+:)', re.IGNORECASE),
+            'hex_noise': re.compile(r'[^0-9a-fA-F]'),
+            # 异步消息：以+开头的消息，以及 ^、# 开头的标准异步消息，合并为一次扫描
+            'async_message': re.compile(r'(?:\+[A-Za-z][A-Za-z0-9_-]*|[#^][A-Z][A-Z0-9_-]*):.*?(?=\n|$)', re.MULTILINE),
         }
 
     def initialize(self) -> None:
@@ -32,7 +132,7 @@ class DataProcessor:
 
     def process_received_data(self, raw_data: bytes,
                             decode_utf8: bool = True,
-                            auto_format: bool = True) -> Dict[str, Any]:
+                            auto_format: bool = True) -> RxResult:
         """
         处理接收到的原始数据
 
@@ -42,45 +142,30 @@ class DataProcessor:
             auto_format: 是否自动格式化
 
         Returns:
-            处理后的数据信息字典
+            处理后的数据信息，需要字典时可调用 _asdict()
         """
-        result = {
-            'raw_data': raw_data,
-            'decoded_data': None,
-            'is_hex': False,
-            'encoding': None,
-            'length': len(raw_data),
-            'timestamp': time.time()
-        }
+        length = len(raw_data)
+        timestamp = time.time()
 
         if not raw_data:
-            result['decoded_data'] = ''
-            result['encoding'] = 'utf-8'
-            return result
+            return RxResult(raw_data, '', False, 'utf-8', length, timestamp)
 
         # 尝试UTF-8解码
         if decode_utf8:
             try:
-                decoded_str = raw_data.decode('utf-8')
-                result['decoded_data'] = decoded_str
-                result['encoding'] = 'utf-8'
-
-                # 如果需要自动格式化，对字符串进行处理
-                if auto_format:
-                    result['decoded_data'] = self._format_string_data(decoded_str)
-
+                # 纯ASCII数据（AT指令的常见情况）走ASCII解码，不会抛出异常
+                decoded_str = raw_data.decode('ascii' if raw_data.isascii() else 'utf-8')
             except UnicodeDecodeError:
                 # 如果UTF-8解码失败，转换为十六进制表示
-                result['decoded_data'] = raw_data.hex()
-                result['is_hex'] = True
-                result['encoding'] = 'hex'
-        else:
-            # 直接转换为十六进制表示
-            result['decoded_data'] = raw_data.hex()
-            result['is_hex'] = True
-            result['encoding'] = 'hex'
+                return RxResult(raw_data, raw_data.hex(), True, 'hex', length, timestamp)
+
+            # 如果需要自动格式化，对字符串进行处理
+            if auto_format:
+                decoded_str = self._format_string_data(decoded_str)
+            return RxResult(raw_data, decoded_str, False, 'utf-8', length, timestamp)
 
-        return result
+        # 直接转换为十六进制表示
+        return RxResult(raw_data, raw_data.hex(), True, 'hex', length, timestamp)
 
     def _format_string_data(self, data: str) -> str:
         """
@@ -116,7 +201,13 @@ class DataProcessor:
         elif isinstance(data, str):
             if encoding.lower() == 'hex':
                 # 处理十六进制字符串
-                hex_str = re.sub(r'[^0-9a-fA-F]', '', data)  # 移除非十六进制字符
+                # 格式规范的输入（可含空白分隔）直接解析，无需正则预处理
+                try:
+                    return bytes.fromhex(data)
+                except ValueError:
+                    pass
+
+                hex_str = self._patterns['hex_noise'].sub('', data)  # 移除非十六进制字符
                 if len(hex_str) % 2 != 0:
                     # 如果长度为奇数，前面补0
                     hex_str = '0' + hex_str
@@ -143,22 +234,42 @@ class DataProcessor:
         Returns:
             数据类型 ('text', 'hex', 'binary', 'at_command')
         """
+        ascii_data = None
         if isinstance(data, bytes):
-            sample_str = data.decode('utf-8', errors='ignore')
+            if data.isascii():
+                # 检查是否为AT命令响应（纯ASCII数据与解码结果一致，直接匹配字节数据）
+                if self._patterns['at_command_response_b'].search(data):
+                    return 'at_command'
+                # 纯ASCII数据无需解码，直接按字节统计可打印字符
+                ascii_data = data
+            else:
+                # 非ASCII数据按解码后的文本匹配，解码时忽略的无效字节不参与判断
+                sample_str = data.decode('utf-8', errors='ignore')
+                if self._patterns['at_command_response'].search(sample_str):
+                    return 'at_command'
         else:
             sample_str = data
 
-        # 检查是否为AT命令响应
-        if self._patterns['at_command_response'].search(sample_str):
-            return 'at_command'
+            # 检查是否为AT命令响应
+            if self._patterns['at_command_response'].search(sample_str):
+                return 'at_command'
 
-        # 检查是否为十六进制数据
-        if isinstance(data, str) and self._patterns['hex_pattern'].match(data.replace(' ', '')):
-            return 'hex'
+            # 检查是否为十六进制数据
+            if self._patterns['hex_pattern'].match(data.replace(' ', '')):
+                return 'hex'
+
+            if data.isascii():
+                ascii_data = data.encode('ascii')
 
         # 检查是否主要是可打印字符
-        printable_chars = sum(1 for c in sample_str if c.isprintable() or c in '\n\r\t')
-        if len(sample_str) > 0 and printable_chars / len(sample_str) > 0.7:
+        if ascii_data is not None:
+            # 删除不可打印字节后的长度即为可打印字符数（单次C层扫描）
+            total_chars = len(ascii_data)
+            printable_chars = len(ascii_data.translate(None, _ASCII_NON_PRINTABLE))
+        else:
+            total_chars = len(sample_str)
+            printable_chars = sum(1 for c in sample_str if c.isprintable() or c in '\n\r\t')
+        if total_chars > 0 and printable_chars / total_chars > 0.7:
             return 'text'
         else:
             return 'binary'
@@ -183,8 +294,8 @@ class DataProcessor:
                 delimiter = delimiter.decode('utf-8')
             packets = data.split(delimiter)
 
-        # 移除空的包
-        return [pkt for pkt in packets if pkt]
+        # 移除空的包（filter(None, ...) 在C层完成过滤）
+        return list(filter(None, packets))
 
     def validate_hex_string(self, hex_str: str) -> bool:
         """
@@ -196,8 +307,10 @@ class DataProcessor:
         Returns:
             是否为有效的十六进制字符串
         """
-        clean_hex = re.sub(r'[^0-9a-fA-F]', '', hex_str)
-        return len(clean_hex) % 2 == 0  # 十六进制字符串长度必须是偶数
+        # 非ASCII字符不可能是十六进制数字，直接丢弃后按删除前后的长度差统计十六进制字符数
+        ascii_bytes = hex_str.encode('ascii', 'ignore')
+        hex_count = len(ascii_bytes) - len(ascii_bytes.translate(None, _HEX_DIGITS))
+        return hex_count % 2 == 0  # 十六进制字符串长度必须是偶数
 
     def format_for_display(self, raw_data: bytes, max_length: int = 100) -> str:
         """
@@ -210,6 +323,12 @@ class DataProcessor:
         Returns:
             格式化的显示字符串
         """
+        if raw_data.isascii():
+            # 纯ASCII数据字节与字符一一对应，只解码需要显示的部分
+            if len(raw_data) > max_length:
+                return raw_data[:max_length].decode('ascii') + '...'
+            return raw_data.decode('ascii')
+
         try:
             # 尝试UTF-8解码
             decoded = raw_data.decode('utf-8')
@@ -217,11 +336,10 @@ class DataProcessor:
                 return decoded[:max_length] + '...'
             return decoded
         except UnicodeDecodeError:
-            # 如果UTF-8解码失败，显示十六进制
-            hex_str = raw_data.hex()
-            if len(hex_str) > max_length:
-                return hex_str[:max_length] + '...'
-            return hex_str
+            # 如果UTF-8解码失败，显示十六进制，只转换需要显示的字节
+            if len(raw_data) * 2 > max_length:
+                return raw_data[:(max_length + 1) // 2].hex()[:max_length] + '...'
+            return raw_data.hex()
 
     def normalize_line_endings(self, text: str) -> str:
         """
@@ -233,6 +351,9 @@ class DataProcessor:
         Returns:
             标准化后的文本
         """
+        # 不含回车符时无需处理（提取出的单行消息通常如此）
+        if '\r' not in text:
+            return text
         return text.replace('\r\n', '\n').replace('\r', '\n')
 
     def extract_async_messages(self, data: str) -> List[str]:
@@ -245,15 +366,11 @@ class DataProcessor:
         Returns:
             异步消息列表
         """
-        # 常见异步消息模式：以+开头的消息
-        async_pattern = re.compile(r'\+[A-Za-z][A-Za-z0-9_-]*:.*?(?=\n|$)', re.MULTILINE)
-        async_messages = async_pattern.findall(data)
-
-        # 标准异步消息，如 ^、# 开头的
-        standard_async_pattern = re.compile(r'[#^][A-Z][A-Z0-9_-]*:.*?(?=\n|$)', re.MULTILINE)
-        async_messages.extend(standard_async_pattern.findall(data))
+        # 单次扫描提取 +、^、# 开头的异步消息，按出现顺序返回
+        async_messages = self._patterns['async_message'].findall(data)
 
-        return [self.normalize_line_endings(msg.strip()) for msg in async_messages if msg.strip()]
+        normalize = self.normalize_line_endings
+        return [normalize(msg) for msg in map(str.strip, async_messages) if msg]
 
     def calculate_data_checksum(self, data: bytes, algorithm: str = 'crc16') -> str:
         """
@@ -266,26 +383,10 @@ class DataProcessor:
         Returns:
             校验和字符串
         """
-        if algorithm == 'crc16':
-            # 简单的CRC16实现
-            crc = 0xFFFF
-            for byte in data:
-                crc ^= byte
-                for _ in range(8):
-                    if crc & 0x0001:
-                        crc >>= 1
-                        crc ^= 0xA001  # CRC16-IBM 多项式反向表示
-                    else:
-                        crc >>= 1
-            return f"{crc:04X}"
-        elif algorithm == 'xor':
-            # 异或校验
-            checksum = 0
-            for byte in data:
-                checksum ^= byte
-            return f"{checksum:02X}"
-        else:
+        checksum_func = _CHECKSUM_FUNCS.get(algorithm)
+        if checksum_func is None:
             raise DataParsingError(f"不支持的校验算法: {algorithm}")
+        return checksum_func(data)
 
     def validate_checksum(self, data: bytes, expected_checksum: str, algorithm: str = 'crc16') -> bool:
         """
@@ -2,10 +2,13 @@
 后台数据接收线程
 负责持续从串口读取数据并进行分流处理
 """
+import os
 import threading
 import queue
+import select
 import time
-from typing import Optional
+from collections import deque
+from typing import Deque, Optional
 import serial
 from ..utils.logger import get_logger
 from ..utils.exceptions import SerialConnectionError
@@ -13,6 +16,14 @@ from ..utils.config import config_manager
 from ..utils.metrics import metrics_collector
 from ..utils.serial_data_logger import serial_data_logger_manager
 
+# 无数据时单次等待串口可读的最长时间，同时决定stop()的响应延迟
+_POLL_INTERVAL = 0.1
+# 无法使用select的平台（如Windows COM口）退化为短暂休眠轮询
+_FALLBACK_POLL_INTERVAL = 0.005
+_CAN_SELECT = os.name != 'nt'
+# 单次从串口读取的最大字节数，突发数据一次取走而不是按1KB分多轮处理
+_MAX_READ_CHUNK = 64 * 1024
+
 
 class BackgroundReader:
     """后台数据接收线程，负责持续从串口读取数据并根据模式进行分流处理"""
@@ -31,11 +42,17 @@ class BackgroundReader:
         self.async_queue = None
         self.current_port = None  # 当前连接的端口
 
-        # 本地缓冲区和状态
-        self._async_buffer = bytearray()
-        self._last_receive_time = time.time()
+        # 本地缓冲区和状态：异步数据按接收块暂存，刷新时一次拼接
+        self._async_chunks: Deque[bytes] = deque()
+        self._async_len = 0
+        # 空闲超时基于单调时钟的整数纳秒计算，不受系统时间调整影响
+        self._last_receive_ns = time.monotonic_ns()
         self._is_running = False
 
+        # 线程运行期间不变的配置项，在start()时缓存，避免主循环中反复查找
+        self._com_log_enabled = False
+        self._idle_timeout_ns = int(self.config.driver.idle_timeout * 1e9)
+
     def initialize(self,
                    connection_manager,
                    sync_mode_event: threading.Event,
@@ -67,15 +84,18 @@ class BackgroundReader:
             self.logger.warning("后台接收线程已在运行中")
             return
 
+        self._com_log_enabled = self.config.logging.com_log_enabled
+        self._idle_timeout_ns = int(self.config.driver.idle_timeout * 1e9)
+
         if port:
             self.current_port = port
             self.logger.info(f"为端口 {port} 启动后台接收线程")
             # 启动串口通信日志记录
-            if self.config.logging.com_log_enabled:
+            if self._com_log_enabled:
                 self.logger.info(f"为端口 {port} 启动通信日志记录")
                 serial_data_logger_manager.start_logging(port)
             else:
-                self.logger.info(f"串口通信日志记录已禁用 (COM_LOG_ENABLED={self.config.logging.com_log_enabled})")
+                self.logger.info(f"串口通信日志记录已禁用 (COM_LOG_ENABLED={self._com_log_enabled})")
 
         self.stop_event.clear()
         self.thread = threading.Thread(target=self._run, daemon=True)
@@ -95,7 +115,7 @@ class BackgroundReader:
         self._is_running = False
 
         # 停止串口通信日志记录
-        if self.current_port and self.config.logging.com_log_enabled:
+        if self.current_port and self._com_log_enabled:
             serial_data_logger_manager.stop_logging(self.current_port)
             self.current_port = None
 
@@ -108,89 +128,87 @@ class BackgroundReader:
         # 为RX数据添加消息缓冲区，用于基于回车换行符的完整消息记录
         rx_message_buffer = bytearray()
 
-        while not self.stop_event.is_set():
+        # 将循环中频繁访问的属性绑定到局部变量
+        stop_is_set = self.stop_event.is_set
+        connection_manager = self.connection_manager
+        log_rx = bool(self.current_port and self._com_log_enabled)
+
+        while not stop_is_set():
             try:
                 # 检查串口是否连接
-                if not self.connection_manager or not self.connection_manager.is_connected():
+                if not connection_manager or not connection_manager.is_connected():
                     # 短暂休眠，避免过度占用CPU
                     time.sleep(0.1)
                     continue
 
-                # 检查是否有可读数据
-                if self.connection_manager.serial_port and self.connection_manager.serial_port.in_waiting > 0:
-                    # 读取可用数据，使用较小的读取块以减少数据拼接问题
-                    chunk_size = min(1024, self.connection_manager.serial_port.in_waiting)
-                    data = self.connection_manager.read(chunk_size)
-
-                    if data:
-                        # 记录接收数据到性能指标
-                        metrics_collector.record_receive(len(data))
-
-                        # 基于回车换行符的消息边界记录日志
-                        if self.current_port and self.config.logging.com_log_enabled:
-                            # 将新数据添加到RX缓冲区
-                            rx_message_buffer.extend(data)
-
-                            # 检查是否有完整的基于回车换行的消息
-                            while b'\n' in rx_message_buffer:
-                                # 找到第一个换行符的位置
-                                newline_idx = rx_message_buffer.find(b'\n')
-                                # 提取完整的消息（包含换行符）
-                                complete_message = rx_message_buffer[:newline_idx + 1]
-                                # 保留剩余数据
-                                rx_message_buffer = rx_message_buffer[newline_idx + 1:]
-
-                                # 记录完整的RX消息到日志
-                                serial_data_logger_manager.log_data(self.current_port, 'RX', complete_message)
-
-                            # 如果没有完整的消息，继续收集数据
-                        else:
-                            # 如果日志未启用，仍然需要更新接收时间
-                            pass
-
-                        # 根据当前模式决定数据流向
-                        if self.sync_mode_event.is_set():
-                            # 同步模式：直接发送到同步响应队列
-                            try:
-                                self.logger.debug(f"接收到同步模式数据: {len(data)} 字节")
-                                self.sync_response_queue.put_nowait(data)
-                                self.logger.debug(f"同步模式：发送 {len(data)} 字节到响应队列: {data!r}")
-
-                                # 如果异步缓冲区有数据，需要强制推送到异步队列
-                                if self._async_buffer:
-                                    self.logger.debug("同步模式下刷新异步缓冲区")
-                                    self._flush_async_buffer()
-
-                            except queue.Full:
-                                self.logger.error("同步响应队列已满")
-                        else:
-                            # 异步模式：添加到异步缓冲区
-                            self.logger.debug(f"接收到异步模式数据: {len(data)} 字节")
-                            self._async_buffer.extend(data)
-                            self._last_receive_time = time.time()
-                            self.logger.debug(f"异步模式：添加 {len(data)} 字节到异步缓冲区: {data!r}")
+                # 一次读取所有可用数据，无数据时立即返回
+                data = connection_manager.read_available(_MAX_READ_CHUNK, block=False)
+
+                if data:
+                    # 记录接收数据到性能指标
+                    metrics_collector.record_receive(len(data))
+
+                    # 基于回车换行符的消息边界记录日志
+                    if log_rx:
+                        # 将新数据添加到RX缓冲区
+                        rx_message_buffer.extend(data)
+
+                        # 一次切分出所有完整的基于换行的消息，最后一段为未完成数据
+                        if b'\n' in data:
+                            lines = rx_message_buffer.split(b'\n')
+                            # 保留剩余数据，继续收集
+                            rx_message_buffer = lines.pop()
+
+                            # 记录完整的RX消息（包含换行符）到日志
+                            for line in lines:
+                                serial_data_logger_manager.log_data(self.current_port, 'RX', line + b'\n')
+                    else:
+                        # 如果日志未启用，仍然需要更新接收时间
+                        pass
+
+                    # 根据当前模式决定数据流向
+                    if self.sync_mode_event.is_set():
+                        # 同步模式：直接发送到同步响应队列
+                        try:
+                            self.logger.debug(f"接收到同步模式数据: {len(data)} 字节")
+                            self.sync_response_queue.put_nowait(data)
+                            self.logger.debug(f"同步模式：发送 {len(data)} 字节到响应队列: {data!r}")
+
+                            # 如果异步缓冲区有数据，需要强制推送到异步队列
+                            if self._async_chunks:
+                                self.logger.debug("同步模式下刷新异步缓冲区")
+                                self._flush_async_buffer()
+
+                        except queue.Full:
+                            self.logger.error("同步响应队列已满")
+                    else:
+                        # 异步模式：添加到异步缓冲区
+                        self.logger.debug(f"接收到异步模式数据: {len(data)} 字节")
+                        self._append_async_data(data)
+                        self.logger.debug(f"异步模式：添加 {len(data)} 字节到异步缓冲区: {data!r}")
 
                 # 检查异步缓冲区是否需要分包（基于空闲超时）
                 self._check_async_idle_timeout()
 
-                # 短暂休眠，避免过度占用CPU
-                time.sleep(0.005)  # 减少休眠时间以提高响应性
+                # 本轮未读到数据时阻塞等待串口可读，读到数据则立即继续读取
+                if not data:
+                    self._wait_for_data(self._next_wait_timeout())
 
             except serial.SerialException as e:
-                if not self.stop_event.is_set():  # 如果不是主动停止
+                if not stop_is_set():  # 如果不是主动停止
                     self.logger.error(f"串口读取异常: {e}")
                     metrics_collector.record_error()
                     # 短暂休眠后继续尝试
                     time.sleep(0.5)
             except Exception as e:
-                if not self.stop_event.is_set():  # 如果不是主动停止
+                if not stop_is_set():  # 如果不是主动停止
                     self.logger.error(f"后台接收线程发生未知错误: {e}")
                     metrics_collector.record_error()
                     # 短暂休眠后继续 try
                     time.sleep(0.5)
 
         # 线程结束前，处理剩余的RX缓冲区数据
-        if rx_message_buffer and self.current_port and self.config.logging.com_log_enabled:
+        if rx_message_buffer and log_rx:
             # 记录未完成的消息（可能没有换行结尾）
             serial_data_logger_manager.log_data(self.current_port, 'RX', bytes(rx_message_buffer))
 
@@ -198,23 +216,65 @@ class BackgroundReader:
         self._flush_async_buffer()
         self.logger.debug("后台接收线程主循环结束")
 
+    def _next_wait_timeout(self) -> float:
+        """
+        计算本次等待串口可读的超时时间
+
+        Returns:
+            等待秒数，异步缓冲区有数据时不超过剩余的空闲超时时间
+        """
+        if not self._async_chunks:
+            return _POLL_INTERVAL
+        remaining_ns = self._idle_timeout_ns - (time.monotonic_ns() - self._last_receive_ns)
+        return min(_POLL_INTERVAL, max(0.0, remaining_ns / 1e9))
+
+    def _wait_for_data(self, timeout: float) -> None:
+        """
+        等待串口有数据可读或超时
+
+        POSIX平台上通过select由内核在数据到达时唤醒线程，
+        无法获取文件描述符的端口退化为短暂休眠
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        serial_port = self.connection_manager.serial_port
+        if _CAN_SELECT and serial_port is not None:
+            try:
+                select.select([serial_port.fileno()], [], [], timeout)
+                return
+            except (AttributeError, TypeError, ValueError, OSError):
+                # 端口不支持fileno或已被关闭
+                pass
+        time.sleep(min(timeout, _FALLBACK_POLL_INTERVAL))
+
+    def _append_async_data(self, data: bytes) -> None:
+        """
+        将异步模式下接收到的数据块追加到异步缓冲区
+
+        Args:
+            data: 接收到的字节数据
+        """
+        self._async_chunks.append(data)
+        self._async_len += len(data)
+        self._last_receive_ns = time.monotonic_ns()
+
     def _check_async_idle_timeout(self) -> None:
         """检查异步消息空闲超时，如果超过设定时间没有新数据，则分包"""
-        current_time = time.time()
-        idle_duration = current_time - self._last_receive_time
-
         # 如果异步缓冲区有数据且空闲时间超过阈值，则进行分包
-        if (self._async_buffer and
-            idle_duration >= self.config.driver.idle_timeout):
+        if (self._async_chunks and
+            time.monotonic_ns() - self._last_receive_ns >= self._idle_timeout_ns):
             self._flush_async_buffer()
 
     def _flush_async_buffer(self) -> None:
         """刷新异步缓冲区，将数据发送到异步消息队列"""
-        if not self._async_buffer:
+        if not self._async_chunks:
             return
 
-        async_data = bytes(self._async_buffer)
-        self._async_buffer.clear()
+        # join按总长度一次分配并依次拷贝各数据块
+        async_data = b''.join(self._async_chunks)
+        self._async_chunks.clear()
+        self._async_len = 0
 
         try:
             # 尝试将异步消息数据放入队列
@@ -225,7 +285,7 @@ class BackgroundReader:
             metrics_collector.record_async_overflow()
 
         # 更新最后接收时间
-        self._last_receive_time = time.time()
+        self._last_receive_ns = time.monotonic_ns()
 
     def is_running(self) -> bool:
         """
@@ -243,9 +303,10 @@ class BackgroundReader:
         Returns:
             接收线程状态信息
         """
+        idle_duration = (time.monotonic_ns() - self._last_receive_ns) / 1e9
         return {
             'is_running': self.is_running(),
-            'async_buffer_size': len(self._async_buffer),
-            'last_receive_time': self._last_receive_time,
-            'idle_duration': time.time() - self._last_receive_time
+            'async_buffer_size': self._async_len,
+            'last_receive_time': time.time() - idle_duration,
+            'idle_duration': idle_duration
         }
\ No newline at end of file
@@ -2,6 +2,7 @@
 串口驱动主类
 实现串口连接、数据收发等核心功能
 """
+import itertools
 import threading
 import queue
 import time
@@ -21,6 +22,28 @@ from .connection_manager import ConnectionManager
 from .reader import BackgroundReader
 from .processor import DataProcessor
 
+# 停止模式编码缓存的最大条目数
+_STOP_PATTERN_CACHE_SIZE = 32
+
+
+def _decode_bytes(data: bytes) -> Tuple[str, bool]:
+    """
+    将字节数据解码为字符串，UTF-8解码失败时返回十六进制表示
+
+    Args:
+        data: 字节数据
+
+    Returns:
+        (解码后的字符串, 是否为十六进制表示) 元组
+    """
+    # 纯ASCII数据单次C级扫描即可确认，直接按ASCII解码
+    if data.isascii():
+        return data.decode('ascii'), False
+    try:
+        return data.decode('utf-8'), False
+    except UnicodeDecodeError:
+        return data.hex(), True
+
 
 class SerialDriver:
     """串口驱动主类，实现串口连接、数据收发等核心功能"""
@@ -44,6 +67,8 @@ class SerialDriver:
 
         # 同步操作相关
         self._current_operation_timeout = self.config.driver.sync_timeout_default
+        # 停止模式编码缓存（AT会话中通常反复使用相同的停止模式）
+        self._stop_pattern_cache: Dict[str, bytes] = {}
 
     def initialize(self) -> None:
         """初始化驱动"""
@@ -138,58 +163,51 @@ class SerialDriver:
             raise SerialConnectionError("串口未连接")
 
         try:
-            # 根据策略获取响应
-            if wait_policy == 'none':
-                # 射后不理模式：直接发送数据
-                # 记录发送数据到性能指标
-                metrics_collector.record_send(len(data))
+            if wait_policy not in ('none', 'keyword', 'timeout'):
+                raise InvalidInputError(f"不支持的等待策略: {wait_policy}")
 
-                self.connection_manager.write(data)
-                decoded_data = data.decode('utf-8', errors='replace') if not is_hex else data.hex()
-                self.logger.debug(f"发送数据: {len(data)} 字节, 内容: {decoded_data}")
-
-                return {
-                    'success': True,
-                    'message': '数据已发送，不等待响应',
-                    'pending_async_count': self.get_pending_async_count()
-                }
-            elif wait_policy in ['keyword', 'timeout']:
+            wait_for_response = wait_policy != 'none'
+            if wait_for_response:
                 # 清空同步响应队列以避免之前的残留数据
-                while not self._sync_response_queue.empty():
-                    try:
-                        self._sync_response_queue.get_nowait()
-                    except queue.Empty:
-                        break
+                self._clear_queue(self._sync_response_queue)
 
                 # 进入同步模式以捕获响应数据
                 self._sync_mode.set()
 
-                # 在发送前短暂延迟，确保模式切换生效
-                time.sleep(0.001)
+            try:
+                if wait_for_response:
+                    # 在发送前短暂延迟，确保模式切换生效
+                    time.sleep(0.001)
 
-                # 发送数据前清空输入缓冲区，防止残留数据干扰
-                self.connection_manager.flush_input()
+                    # 发送数据前清空输入缓冲区，防止残留数据干扰
+                    self.connection_manager.flush_input()
 
                 # 记录发送数据到性能指标
-                metrics_collector.record_send(len(data))
+                data_len = len(data)
+                metrics_collector.record_send(data_len)
 
-                self.connection_manager.write(data)
+                # 需要等待响应时确保数据已发出再开始计时接收
+                self.connection_manager.write(data, drain=wait_for_response)
                 decoded_data = data.decode('utf-8', errors='replace') if not is_hex else data.hex()
-                self.logger.debug(f"发送数据: {len(data)} 字节, 内容: {decoded_data}")
+                self.logger.debug(f"发送数据: {data_len} 字节, 内容: {decoded_data}")
+
+                if not wait_for_response:
+                    # 射后不理模式：不等待响应
+                    return {
+                        'success': True,
+                        'message': '数据已发送，不等待响应',
+                        'pending_async_count': self.get_pending_async_count()
+                    }
 
                 # 立即开始接收响应（在同步模式下）
                 if wait_policy == 'keyword':
                     # 关键字模式：等待直到找到指定的停止模式
-                    result = self._receive_until_keyword(stop_pattern, timeout)
-                elif wait_policy == 'timeout':
-                    result = self._receive_until_timeout(timeout)
-
-                # 退出同步模式
-                self._sync_mode.clear()
-
-                return result
-            else:
-                raise InvalidInputError(f"不支持的等待策略: {wait_policy}")
+                    return self._receive_until_keyword(stop_pattern, timeout)
+                return self._receive_until_timeout(timeout)
+            finally:
+                if wait_for_response:
+                    # 退出同步模式，清空输入缓冲区或写入失败时也不会滞留在同步模式
+                    self._sync_mode.clear()
 
         except Exception as e:
             metrics_collector.record_error()
@@ -201,156 +219,158 @@ class SerialDriver:
         if not stop_pattern:
             raise InvalidInputError("停止模式不能为空")
 
-        start_time = time.time()
-        received_data = b""
-        stop_pattern_bytes = stop_pattern.encode('utf-8')
-
-        while time.time() - start_time < timeout:
-            try:
-                # 尝试从同步响应队列获取数据
-                chunk = self._sync_response_queue.get(timeout=0.1)
-                if chunk:
-                    received_data += chunk
-                    self.logger.debug(f"接收到数据块: {chunk!r}, 累计: {received_data!r}")
-
-                    # 检查是否包含停止模式
-                    if stop_pattern_bytes in received_data:
-                        self.logger.debug(f"找到停止模式 '{stop_pattern}' 在数据中")
-                        break
-            except queue.Empty:
-                # 继续等待
-                continue
+        received_data, found = self._collect(timeout, self._encode_stop_pattern(stop_pattern))
 
         # 如果超时仍未收到停止模式，则视为超时
-        if stop_pattern_bytes not in received_data:
+        if not found:
             self.logger.warning(f"接收超时，未找到停止模式: {stop_pattern}")
             raise SerialTimeoutError(f"接收超时，未找到停止模式: {stop_pattern}")
 
-        # 记录接收数据到性能指标
-        if received_data:
-            metrics_collector.record_receive(len(received_data))
-
-        if received_data:
-            # 尝试解码为字符串
-            try:
-                decoded_data = received_data.decode('utf-8')
-                is_hex = False
-            except UnicodeDecodeError:
-                decoded_data = received_data.hex()
-                is_hex = True
-
-            return {
-                'data': decoded_data,
-                'raw_data': received_data,
-                'is_hex': is_hex,
-                'found_stop_pattern': stop_pattern_bytes in received_data,
-                'bytes_received': len(received_data),
-                'pending_async_count': self.get_pending_async_count(),
-                'success': True
-            }
-        else:
-            return {
-                'data': '',
-                'raw_data': b'',
-                'is_hex': False,
-                'found_stop_pattern': False,
-                'bytes_received': 0,
-                'pending_async_count': self.get_pending_async_count(),
-                'success': True
-            }
+        result = self._build_result(received_data)
+        result['found_stop_pattern'] = found
+        result['pending_async_count'] = self.get_pending_async_count()
+        result['success'] = True
+        return result
 
     def _receive_until_timeout(self, timeout: float) -> Dict[str, Any]:
         """在指定时间内接收所有数据"""
-        start_time = time.time()
-        received_data = b""
-
-        while time.time() - start_time < timeout:
-            try:
-                # 尝试从同步响应队列获取数据
-                chunk = self._sync_response_queue.get(timeout=0.1)
-                if chunk:
-                    received_data += chunk
-            except queue.Empty:
-                # 继续等待直到时间结束
-                continue
-
-        # 记录接收数据到性能指标
-        if received_data:
-            metrics_collector.record_receive(len(received_data))
+        received_data, _ = self._collect(timeout)
 
-        if received_data:
-            # 尝试解码为字符串
-            try:
-                decoded_data = received_data.decode('utf-8')
-                is_hex = False
-            except UnicodeDecodeError:
-                decoded_data = received_data.hex()
-                is_hex = True
-
-            return {
-                'data': decoded_data,
-                'raw_data': received_data,
-                'is_hex': is_hex,
-                'bytes_received': len(received_data),
-                'pending_async_count': self.get_pending_async_count(),
-                'success': True
-            }
-        else:
-            return {
-                'data': '',
-                'raw_data': b'',
-                'is_hex': False,
-                'bytes_received': 0,
-                'pending_async_count': self.get_pending_async_count(),
-                'success': True
-            }
+        result = self._build_result(received_data)
+        result['pending_async_count'] = self.get_pending_async_count()
+        result['success'] = True
+        return result
 
     def _receive_for_timeout(self, duration: float) -> Dict[str, Any]:
         """在指定时间内接收数据"""
-        start_time = time.time()
-        received_data = b""
+        return self._receive_until_timeout(duration)
+
+    def _encode_stop_pattern(self, stop_pattern: str) -> bytes:
+        """将停止模式编码为字节，并缓存编码结果"""
+        stop_bytes = self._stop_pattern_cache.get(stop_pattern)
+        if stop_bytes is None:
+            # 缓存容量有限，满时整体清空以避免无限增长
+            if len(self._stop_pattern_cache) >= _STOP_PATTERN_CACHE_SIZE:
+                self._stop_pattern_cache.clear()
+            stop_bytes = self._stop_pattern_cache[stop_pattern] = stop_pattern.encode('utf-8')
+        return stop_bytes
+
+    def _collect(self, timeout: float, stop_pattern_bytes: Optional[bytes] = None) -> Tuple[bytes, bool]:
+        """
+        从同步响应队列收集数据，直到超时或找到停止模式
 
-        while time.time() - start_time < duration:
+        Args:
+            timeout: 最长接收时间（秒）
+            stop_pattern_bytes: 停止模式字节序列，None表示一直接收到超时
+
+        Returns:
+            (接收到的数据, 是否找到停止模式) 元组
+        """
+        deadline = time.monotonic() + timeout
+        buf = bytearray()
+        # 仅在新到达的数据（及可能跨块的模式前缀）中搜索停止模式
+        search_from = 0
+        overlap = len(stop_pattern_bytes) - 1 if stop_pattern_bytes else 0
+
+        # 循环内使用的属性绑定到局部变量
+        monotonic = time.monotonic
+        q_get = self._sync_response_queue.get
+        drain = self._drain_sync_queue
+        log_debug = self.logger.debug
+
+        while (remaining := deadline - monotonic()) > 0:
             try:
                 # 尝试从同步响应队列获取数据
-                chunk = self._sync_response_queue.get(timeout=0.1)
-                if chunk:
-                    received_data += chunk
+                chunk = q_get(timeout=min(0.1, remaining))
             except queue.Empty:
-                # 继续等待直到时间结束
+                # 继续等待
                 continue
 
-        # 记录接收数据到性能指标
-        if received_data:
-            metrics_collector.record_receive(len(received_data))
+            buf.extend(chunk)
+            # 一次唤醒后批量取出队列中已积累的数据块
+            drain(buf)
 
-        if received_data:
-            # 尝试解码为字符串
-            try:
-                decoded_data = received_data.decode('utf-8')
-                is_hex = False
-            except UnicodeDecodeError:
-                decoded_data = received_data.hex()
-                is_hex = True
+            if stop_pattern_bytes and len(buf) > search_from:
+                log_debug(f"接收到数据块: {chunk!r}, 累计: {buf!r}")
 
-            return {
-                'data': decoded_data,
-                'raw_data': received_data,
-                'is_hex': is_hex,
-                'bytes_received': len(received_data),
-                'pending_async_count': self.get_pending_async_count(),
-                'success': True
-            }
-        else:
+                # 检查是否包含停止模式
+                if buf.find(stop_pattern_bytes, max(0, search_from - overlap)) != -1:
+                    log_debug(f"找到停止模式: {stop_pattern_bytes!r}")
+                    return bytes(buf), True
+                search_from = len(buf)
+
+        return bytes(buf), False
+
+    def _build_result(self, received_data: bytes) -> Dict[str, Any]:
+        """
+        记录接收指标并将接收到的数据构造成结果字典
+
+        Args:
+            received_data: 接收到的字节数据
+
+        Returns:
+            包含解码数据的结果字典
+        """
+        if not received_data:
             return {
                 'data': '',
                 'raw_data': b'',
                 'is_hex': False,
-                'bytes_received': 0,
-                'pending_async_count': self.get_pending_async_count(),
-                'success': True
+                'bytes_received': 0
             }
 
+        # 记录接收数据到性能指标
+        metrics_collector.record_receive(len(received_data))
+
+        # 尝试解码为字符串
+        decoded_data, is_hex = _decode_bytes(received_data)
+
+        return {
+            'data': decoded_data,
+            'raw_data': received_data,
+            'is_hex': is_hex,
+            'bytes_received': len(received_data)
+        }
+
+    def _drain_sync_queue(self, buf: bytearray) -> None:
+        """非阻塞地取出同步响应队列中已有的全部数据块并追加到缓冲区"""
+        get_nowait = self._sync_response_queue.get_nowait
+        extend = buf.extend
+        try:
+            while True:
+                extend(get_nowait())
+        except queue.Empty:
+            pass
+
+    @staticmethod
+    def _clear_queue(q: queue.Queue) -> None:
+        """在一次加锁内清空队列，而不是逐个取出元素"""
+        with q.mutex:
+            q.queue.clear()
+            q.unfinished_tasks = 0
+            q.all_tasks_done.notify_all()
+            q.not_full.notify_all()
+
+    @staticmethod
+    def _snapshot_queue(q: queue.Queue, clear: bool, max_items: Optional[int] = None) -> List[Any]:
+        """在一次加锁内获取队列中元素的快照（最多max_items个），可选地同时将其取出"""
+        with q.mutex:
+            if max_items is None or max_items >= len(q.queue):
+                items = list(q.queue)
+                if clear:
+                    q.queue.clear()
+                    q.unfinished_tasks = 0
+            else:
+                items = list(itertools.islice(q.queue, max_items))
+                if clear:
+                    for _ in range(max_items):
+                        q.queue.popleft()
+                    q.unfinished_tasks = max(0, q.unfinished_tasks - max_items)
+            if clear:
+                if not q.unfinished_tasks:
+                    q.all_tasks_done.notify_all()
+                q.not_full.notify_all()
+        return items
 
     def send_string(self, data: str, encoding: str = 'utf-8') -> None:
         """
@@ -367,11 +387,7 @@ class SerialDriver:
         """进入同步模式，所有接收到的数据将被路由到同步响应队列"""
         self._sync_mode.set()
         # 清空之前可能存在的响应数据
-        while not self._sync_response_queue.empty():
-            try:
-                self._sync_response_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._clear_queue(self._sync_response_queue)
 
     def exit_sync_mode(self) -> None:
         """退出同步模式，所有接收到的数据将被路由到URC队列"""
@@ -391,52 +407,22 @@ class SerialDriver:
         if timeout is None:
             timeout = self._current_operation_timeout
 
-        start_time = time.time()
-        received_data = b""
-
-        while time.time() - start_time < timeout:
-            try:
-                # 尝试从同步响应队列获取数据
-                chunk = self._sync_response_queue.get(timeout=0.1)
-                if chunk:
-                    received_data += chunk
-
-                    # 检查是否包含停止模式
-                    if stop_pattern and stop_pattern.encode() in received_data:
-                        self.logger.debug(f"找到停止模式: {stop_pattern}")
-                        break
-            except queue.Empty:
-                # 继续等待
-                continue
+        # 停止模式只编码一次
+        stop_bytes = self._encode_stop_pattern(stop_pattern) if stop_pattern else None
+        received_data, found = self._collect(timeout, stop_bytes)
 
         # 如果超时仍未收到停止模式，则视为超时
-        if stop_pattern and stop_pattern.encode() not in received_data:
+        if stop_bytes and not found:
             self.logger.warning(f"接收超时，未找到停止模式: {stop_pattern}")
             raise SerialTimeoutError(f"接收超时，未找到停止模式: {stop_pattern}")
 
-        # 记录接收数据到性能指标
-        if received_data:
-            metrics_collector.record_receive(len(received_data))
-
-        if received_data:
-            # 尝试解码为字符串
-            try:
-                decoded_data = received_data.decode('utf-8')
-                is_hex = False
-            except UnicodeDecodeError:
-                decoded_data = received_data.hex()
-                is_hex = True
-
-            return {
-                'data': decoded_data,
-                'raw_data': received_data,
-                'is_hex': is_hex,
-                'found_stop_pattern': stop_pattern.encode() in received_data if stop_pattern else False,
-                'bytes_received': len(received_data)
-            }
-        else:
+        if not received_data:
             return None
 
+        result = self._build_result(received_data)
+        result['found_stop_pattern'] = found
+        return result
+
     def receive_for_timeout(self, duration: float) -> Dict[str, Any]:
         """
         按指定时间接收数据
@@ -447,45 +433,8 @@ class SerialDriver:
         Returns:
             接收到的数据和相关信息的字典
         """
-        start_time = time.time()
-        received_data = b""
-
-        while time.time() - start_time < duration:
-            try:
-                # 尝试从同步响应队列获取数据
-                chunk = self._sync_response_queue.get(timeout=0.1)
-                if chunk:
-                    received_data += chunk
-            except queue.Empty:
-                # 继续等待直到时间结束
-                continue
-
-        # 记录接收数据到性能指标
-        if received_data:
-            metrics_collector.record_receive(len(received_data))
-
-        if received_data:
-            # 尝试解码为字符串
-            try:
-                decoded_data = received_data.decode('utf-8')
-                is_hex = False
-            except UnicodeDecodeError:
-                decoded_data = received_data.hex()
-                is_hex = True
-
-            return {
-                'data': decoded_data,
-                'raw_data': received_data,
-                'is_hex': is_hex,
-                'bytes_received': len(received_data)
-            }
-        else:
-            return {
-                'data': '',
-                'raw_data': b'',
-                'is_hex': False,
-                'bytes_received': 0
-            }
+        received_data, _ = self._collect(duration)
+        return self._build_result(received_data)
 
     def receive_no_wait(self) -> Dict[str, Any]:
         """
@@ -499,43 +448,37 @@ class SerialDriver:
             'message': '数据已发送，不等待响应'
         }
 
-    def get_async_messages(self, clear: bool = True) -> List[Dict[str, Any]]:
+    def get_async_messages(self, clear: bool = True, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         获取异步消息
 
         Args:
-            clear: 是否清空异步消息队列
+            clear: 是否在读取后清空异步消息队列，False时仅查看不取出
+            max_items: 最多获取的消息条数，None表示全部；剩余消息保留在队列中
 
         Returns:
             异步消息列表
         """
+        # 在一次加锁内获取队列快照，避免与后台线程竞争导致循环无法结束
+        raw_items = self._snapshot_queue(self._async_queue, clear, max_items)
+
         async_messages = []
+        timestamp = time.time()
+        for async_data in raw_items:
+            # 处理异步消息数据
+            decoded_data, is_hex = _decode_bytes(async_data)
 
-        while True:
-            try:
-                if clear:
-                    async_data = self._async_queue.get_nowait()
-                else:
-                    async_data = self._async_queue.get(timeout=0.1)
-
-                # 处理异步消息数据
-                try:
-                    decoded_data = async_data.decode('utf-8')
-                    is_hex = False
-                except UnicodeDecodeError:
-                    decoded_data = async_data.hex()
-                    is_hex = True
-
-                async_messages.append({
-                    'data': decoded_data,
-                    'raw_data': async_data,
-                    'is_hex': is_hex,
-                    'timestamp': time.time()
-                })
+            async_messages.append({
+                'data': decoded_data,
+                'raw_data': async_data,
+                'is_hex': is_hex,
+                'timestamp': timestamp
+            })
 
+        # 仅在消息被取出时计入已处理数量
+        if clear:
+            for _ in raw_items:
                 metrics_collector.record_async_message()
-            except queue.Empty:
-                break
 
         return async_messages
 
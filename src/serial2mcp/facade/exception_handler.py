@@ -2,6 +2,7 @@
 异常处理器
 负责捕获和处理驱动层异常并转换为 MCP 格式
 """
+import time
 import traceback
 from typing import Dict, Any
 from ..utils.logger import get_logger
@@ -18,6 +19,27 @@ from ..utils.exceptions import (
     DriverNotInitializedError
 )
 
+# 异常类型到 (错误类型描述, 错误消息格式, 错误代码) 的映射
+_ERROR_RESPONSES = {
+    SerialConnectionError: ("串口连接错误", "{}", "SERIAL_CONNECTION_ERROR"),
+    SerialConfigurationError: ("串口配置错误", "{}", "SERIAL_CONFIGURATION_ERROR"),
+    SerialDataError: ("串口数据错误", "{}", "SERIAL_DATA_ERROR"),
+    MCPProtocolError: ("MCP协议错误", "{}", "MCP_PROTOCOL_ERROR"),
+    DataParsingError: ("数据解析错误", "{}", "DATA_PARSING_ERROR"),
+    SerialTimeoutError: ("操作超时", "{}", "TIMEOUT_ERROR"),
+    InvalidInputError: ("无效输入", "{}", "INVALID_INPUT_ERROR"),
+    AsyncMessageHandlerError: ("异步消息处理错误", "{}", "ASYNC_MESSAGE_HANDLER_ERROR"),
+    DriverNotInitializedError: ("驱动未初始化", "{}", "DRIVER_NOT_INITIALIZED"),
+    NotImplementedError: ("功能未实现", "该功能尚未实现: {}", "NOT_IMPLEMENTED_ERROR"),
+    AttributeError: ("属性错误", "访问不存在的属性: {}", "ATTRIBUTE_ERROR"),
+    ValueError: ("值错误", "无效的值: {}", "VALUE_ERROR"),
+    TypeError: ("类型错误", "类型不匹配: {}", "TYPE_ERROR"),
+    # 系统级错误，如串口被占用等
+    OSError: ("系统错误", "系统级错误: {}", "SYSTEM_ERROR"),
+    # 其他未分类的异常返回通用错误
+    Exception: ("未知错误", "发生未知错误: {}", "UNKNOWN_ERROR"),
+}
+
 
 class ExceptionHandler:
     """异常处理器，负责捕获和处理驱动层异常并转换为MCP格式"""
@@ -42,121 +64,23 @@ class ExceptionHandler:
             exc_info=True  # 记录完整的堆栈跟踪
         )
 
-        # 根据异常类型返回不同的错误响应
-        if isinstance(exception, SerialConnectionError):
-            return self._create_error_response(
-                "串口连接错误",
-                str(exception),
-                error_code="SERIAL_CONNECTION_ERROR"
-            )
-
-        elif isinstance(exception, SerialConfigurationError):
-            return self._create_error_response(
-                "串口配置错误",
-                str(exception),
-                error_code="SERIAL_CONFIGURATION_ERROR"
-            )
-
-        elif isinstance(exception, SerialDataError):
-            return self._create_error_response(
-                "串口数据错误",
-                str(exception),
-                error_code="SERIAL_DATA_ERROR"
-            )
-
-        elif isinstance(exception, MCPProtocolError):
-            return self._create_error_response(
-                "MCP协议错误",
-                str(exception),
-                error_code="MCP_PROTOCOL_ERROR"
-            )
-
-        elif isinstance(exception, DataParsingError):
-            return self._create_error_response(
-                "数据解析错误",
-                str(exception),
-                error_code="DATA_PARSING_ERROR"
-            )
-
-        elif isinstance(exception, SerialTimeoutError):
-            return self._create_error_response(
-                "操作超时",
-                str(exception),
-                error_code="TIMEOUT_ERROR"
-            )
-
-        elif isinstance(exception, InvalidInputError):
-            return self._create_error_response(
-                "无效输入",
-                str(exception),
-                error_code="INVALID_INPUT_ERROR"
-            )
-
-        elif isinstance(exception, AsyncMessageHandlerError):
-            return self._create_error_response(
-                "异步消息处理错误",
-                str(exception),
-                error_code="ASYNC_MESSAGE_HANDLER_ERROR"
-            )
-
-        elif isinstance(exception, DriverNotInitializedError):
-            return self._create_error_response(
-                "驱动未初始化",
-                str(exception),
-                error_code="DRIVER_NOT_INITIALIZED"
-            )
-
-        elif isinstance(exception, NotImplementedError):
-            return self._create_error_response(
-                "功能未实现",
-                f"该功能尚未实现: {str(exception)}",
-                error_code="NOT_IMPLEMENTED_ERROR"
-            )
-
-        elif isinstance(exception, AttributeError):
-            return self._create_error_response(
-                "属性错误",
-                f"访问不存在的属性: {str(exception)}",
-                error_code="ATTRIBUTE_ERROR"
-            )
-
-        elif isinstance(exception, ValueError):
-            return self._create_error_response(
-                "值错误",
-                f"无效的值: {str(exception)}",
-                error_code="VALUE_ERROR"
-            )
-
-        elif isinstance(exception, TypeError):
-            return self._create_error_response(
-                "类型错误",
-                f"类型不匹配: {str(exception)}",
-                error_code="TYPE_ERROR"
-            )
-
-        elif isinstance(exception, OSError):
-            # 处理系统级错误，如串口被占用等
-            return self._create_error_response(
-                "系统错误",
-                f"系统级错误: {str(exception)}",
-                error_code="SYSTEM_ERROR"
-            )
-
-        elif isinstance(exception, Exception):
-            # 对于其他未分类的异常，返回通用错误
-            return self._create_error_response(
-                "未知错误",
-                f"发生未知错误: {str(exception)}",
-                error_code="UNKNOWN_ERROR"
-            )
-
-        else:
-            # 万能兜底处理
-            return self._create_error_response(
-                "未知异常",
-                f"发生未知异常: {str(exception)}",
-                error_code="UNKNOWN_EXCEPTION"
-            )
+        # 沿异常类的MRO查表，命中最具体的已登记类型
+        for cls in type(exception).__mro__:
+            entry = _ERROR_RESPONSES.get(cls)
+            if entry is not None:
+                error_type, message_format, error_code = entry
+                return self._create_error_response(
+                    error_type,
+                    message_format.format(exception),
+                    error_code=error_code
+                )
+
+        # 万能兜底处理
+        return self._create_error_response(
+            "未知异常",
+            f"发生未知异常: {str(exception)}",
+            error_code="UNKNOWN_EXCEPTION"
+        )
 
     def _create_error_response(self, error_type: str, error_message: str,
                               error_code: str = "UNKNOWN_ERROR") -> Dict[str, Any]:
@@ -176,7 +100,7 @@ class ExceptionHandler:
             'error_type': error_type,
             'error_message': error_message,
             'error_code': error_code,
-            'timestamp': __import__('time').time()
+            'timestamp': time.time()
         }
 
     def safe_execute(self, func, *args, **kwargs) -> Dict[str, Any]:
@@ -202,7 +126,7 @@ class ExceptionHandler:
                 return {
                     'success': True,
                     'data': result,
-                    'timestamp': __import__('time').time()
+                    'timestamp': time.time()
                 }
 
         except Exception as e:
@@ -220,20 +144,23 @@ class ExceptionHandler:
         # 此方法可在未来扩展，为特定异常类型提供自定义处理逻辑
         pass
 
-    def get_error_info(self, exception: Exception) -> Dict[str, Any]:
+    def get_error_info(self, exception: Exception, include_traceback: bool = False) -> Dict[str, Any]:
         """
         获取异常的详细信息
 
         Args:
             exception: 异常对象
+            include_traceback: 是否格式化堆栈跟踪，格式化需要遍历整个调用栈，仅在需要时开启
 
         Returns:
             异常详细信息字典
         """
-        return {
+        info = {
             'exception_type': type(exception).__name__,
             'exception_message': str(exception),
-            'traceback': traceback.format_exc(),
             'module': getattr(exception, '__module__', 'unknown'),
-            'timestamp': __import__('time').time()
-        }
\ No newline at end of file
+            'timestamp': time.time()
+        }
+        if include_traceback:
+            info['traceback'] = traceback.format_exc()
+        return info
\ No newline at end of file
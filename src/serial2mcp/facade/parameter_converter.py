@@ -3,10 +3,39 @@
 负责 MCP 工具参数与驱动方法参数之间的转换
 """
 import re
-from typing import Union, Dict, Any
+import string
+from typing import Union, Dict, Any, Tuple
 from ..utils.logger import get_logger
 from ..utils.exceptions import InvalidInputError
-from ..driver.processor import DataProcessor
+
+# 预编译常用的正则表达式
+_HEX_STRIP_RE = re.compile(r'[^0-9a-fA-F]')
+# ASCII 范围内非十六进制字符的删除表，供 str.translate 使用
+_HEX_DIGITS = '0123456789abcdefABCDEF'
+_HEX_DEL_TABLE = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in _HEX_DIGITS))
+# 转义序列 \\r\\n, \\n, \\r 到实际控制字符的映射
+_ESC_RE = re.compile(r'\\r\\n|\\n|\\r')
+_ESC_MAP = {'\\r\\n': '\r\n', '\\n': '\n', '\\r': '\r'}
+# 停止模式允许的字符（可打印字符，已包含 \n、\r、\t），删除后剩余即为非法字符
+_STOP_PATTERN_DEL_TABLE = str.maketrans('', '', string.printable)
+# 有效的等待策略和编码格式
+_VALID_POLICIES = frozenset(('keyword', 'timeout', 'none'))
+_VALID_POLICIES_STR = 'keyword, timeout, none'
+_VALID_ENCODINGS = frozenset(('utf8', 'hex'))
+_VALID_ENCODINGS_STR = 'utf8, hex'
+# Windows: COM1, COM2, etc. | Linux: /dev/ttyUSB0, /dev/ttyACM0, etc. | macOS: /dev/cu.usbserial, /dev/tty.usbserial, etc.
+_PORT_RE = re.compile(r'^(COM\d+|/dev/(ttyUSB|ttyACM|cu\..+|tty\..+|serial/.+))$', re.IGNORECASE)
+# 编码结果缓存：常用AT指令反复发送，缓存条目数及可缓存的最大载荷长度
+_ENCODE_CACHE_SIZE = 256
+_ENCODE_CACHE_MAX_LEN = 256
+
+
+def _strip_non_hex(data: str) -> str:
+    """移除字符串中的非十六进制字符"""
+    if data.isascii():
+        return data.translate(_HEX_DEL_TABLE)
+    # 含非ASCII字符时回退到正则处理
+    return _HEX_STRIP_RE.sub('', data)
 
 
 class ParameterConverter:
@@ -15,12 +44,11 @@ class ParameterConverter:
     def __init__(self):
         """初始化参数转换器"""
         self.logger = get_logger("parameter_converter")
-        self.data_processor = DataProcessor()
-        self.data_processor.initialize()
+        self._encode_cache: Dict[tuple, bytes] = {}
 
     def convert_to_bytes(self, data: str, encoding: str = 'utf8') -> bytes:
         """
-        将输入数据转换为字节
+        将输入数据转换为字节，短载荷的转换结果会被缓存
 
         Args:
             data: 输入数据（字符串形式）
@@ -35,34 +63,71 @@ class ParameterConverter:
         if not data:
             return b''
 
+        key = (data, encoding)
+        result = self._encode_cache.get(key)
+        if result is None:
+            result, cacheable = self._encode(data, encoding)
+            # 转换时产生告警的输入不缓存，使调用方每次都能得到提示
+            if cacheable and len(data) <= _ENCODE_CACHE_MAX_LEN:
+                # 缓存容量有限，满时整体清空以避免无限增长
+                if len(self._encode_cache) >= _ENCODE_CACHE_SIZE:
+                    self._encode_cache.clear()
+                self._encode_cache[key] = result
+        return result
+
+    def _encode(self, data: str, encoding: str) -> Tuple[bytes, bool]:
+        """
+        执行实际的字符串到字节转换
+
+        Args:
+            data: 非空输入字符串
+            encoding: 编码格式 ('utf8', 'hex')
+
+        Returns:
+            (转换后的字节数据, 结果是否可缓存) 元组，转换过程中记录了告警时不可缓存
+        """
         encoding_lower = encoding.lower()
 
         if encoding_lower == 'utf8':
             try:
-                # 处理常见的转义序列
-                # 将 \\r\\n, \\n, \\r 等转换为实际的控制字符
-                processed_data = data.replace('\\r\\n', '\r\n').replace('\\n', '\n').replace('\\r', '\r')
-                return processed_data.encode('utf-8')
+                # 不含反斜杠时无需处理转义序列
+                if '\\' not in data:
+                    processed_data = data
+                else:
+                    # 处理常见的转义序列
+                    # 将 \\r\\n, \\n, \\r 等转换为实际的控制字符（单次扫描）
+                    processed_data = _ESC_RE.sub(lambda m: _ESC_MAP[m.group(0)], data)
+                # 纯ASCII字符串（AT指令的常见情况）走更快的ASCII编码路径
+                if processed_data.isascii():
+                    return processed_data.encode('ascii'), True
+                return processed_data.encode('utf-8'), True
             except UnicodeEncodeError as e:
                 self.logger.error(f"UTF-8编码失败: {e}")
                 raise InvalidInputError(f"UTF-8编码失败: {e}")
 
         elif encoding_lower == 'hex':
             # 处理十六进制字符串
+            # 格式规范的输入（可含空白分隔）直接解析，无需预处理
+            try:
+                return bytes.fromhex(data), True
+            except ValueError:
+                pass
+
             # 移除可能的空格和其他非十六进制字符
-            hex_str = re.sub(r'[^0-9a-fA-F]', '', data)
+            hex_str = _strip_non_hex(data)
 
             # 如果长度为奇数，在前面补0
-            if len(hex_str) % 2 != 0:
+            padded = len(hex_str) % 2 != 0
+            if padded:
                 self.logger.warning(f"十六进制字符串长度为奇数 ({len(hex_str)})，前面补0")
                 hex_str = '0' + hex_str
 
             if not hex_str:
                 self.logger.warning("十六进制字符串为空，返回空字节")
-                return b''
+                return b'', False
 
             try:
-                return bytes.fromhex(hex_str)
+                return bytes.fromhex(hex_str), not padded
             except ValueError as e:
                 self.logger.error(f"无效的十六进制字符串 '{data}': {e}")
                 raise InvalidInputError(f"无效的十六进制字符串: {e}")
@@ -99,8 +164,7 @@ class ParameterConverter:
 
         elif encoding_lower == 'hex':
             # 返回十六进制字符串，每两个字符之间用空格分隔以提高可读性
-            hex_str = data.hex()
-            return ' '.join(hex_str[i:i+2] for i in range(0, len(hex_str), 2))
+            return data.hex(' ')
 
         else:
             raise InvalidInputError(f"不支持的编码格式: {encoding}，支持的格式: utf8, hex")
@@ -119,10 +183,7 @@ class ParameterConverter:
             return False
 
         # 常见的串口命名模式验证
-        import re
-        # Windows: COM1, COM2, etc. | Linux: /dev/ttyUSB0, /dev/ttyACM0, etc. | macOS: /dev/cu.usbserial, /dev/tty.usbserial, etc.
-        port_pattern = r'^(COM\d+|/dev/(ttyUSB|ttyACM|cu\..+|tty\..+|serial/.+))$'
-        return bool(re.match(port_pattern, port.strip(), re.IGNORECASE))
+        return bool(_PORT_RE.match(port.strip()))
 
     def parse_baudrate(self, baudrate_input: Union[str, int, float]) -> int:
         """
@@ -134,15 +195,10 @@ class ParameterConverter:
         Returns:
             解析后的波特率整数值
         """
-        if isinstance(baudrate_input, (int, float)):
-            baudrate = int(baudrate_input)
-        elif isinstance(baudrate_input, str):
-            try:
-                baudrate = int(baudrate_input.strip())
-            except ValueError:
-                raise InvalidInputError(f"无效的波特率值: {baudrate_input}")
-        else:
-            raise InvalidInputError(f"波特率必须是数字类型，当前类型: {type(baudrate_input)}")
+        try:
+            baudrate = int(baudrate_input.strip() if isinstance(baudrate_input, str) else baudrate_input)
+        except (TypeError, ValueError) as e:
+            raise InvalidInputError(f"无效的波特率值: {baudrate_input}，当前类型: {type(baudrate_input)}") from e
 
         # 常见的有效波特率范围验证
         if baudrate <= 0 or baudrate > 1500000:  # 通常波特率不会超过1.5Mbps
@@ -163,15 +219,10 @@ class ParameterConverter:
         if timeout_input is None:
             return 5.0  # 默认5秒
 
-        if isinstance(timeout_input, (int, float)):
-            timeout = float(timeout_input)
-        elif isinstance(timeout_input, str):
-            try:
-                timeout = float(timeout_input.strip())
-            except ValueError:
-                raise InvalidInputError(f"无效的超时值: {timeout_input}")
-        else:
-            raise InvalidInputError(f"超时值必须是数字类型，当前类型: {type(timeout_input)}")
+        try:
+            timeout = float(timeout_input.strip() if isinstance(timeout_input, str) else timeout_input)
+        except (TypeError, ValueError) as e:
+            raise InvalidInputError(f"无效的超时值: {timeout_input}，当前类型: {type(timeout_input)}") from e
 
         # 超时值合理性检查
         if timeout <= 0 or timeout > 300:  # 最大5分钟
@@ -194,9 +245,8 @@ class ParameterConverter:
 
         normalized_policy = wait_policy.lower().strip()
 
-        valid_policies = ['keyword', 'timeout', 'none']
-        if normalized_policy not in valid_policies:
-            raise InvalidInputError(f"无效的等待策略: {wait_policy}，有效的策略: {', '.join(valid_policies)}")
+        if normalized_policy not in _VALID_POLICIES:
+            raise InvalidInputError(f"无效的等待策略: {wait_policy}，有效的策略: {_VALID_POLICIES_STR}")
 
         return normalized_policy
 
@@ -215,9 +265,8 @@ class ParameterConverter:
 
         normalized_encoding = encoding.lower().strip()
 
-        valid_encodings = ['utf8', 'hex']
-        if normalized_encoding not in valid_encodings:
-            raise InvalidInputError(f"无效的编码格式: {encoding}，有效的格式: {', '.join(valid_encodings)}")
+        if normalized_encoding not in _VALID_ENCODINGS:
+            raise InvalidInputError(f"无效的编码格式: {encoding}，有效的格式: {_VALID_ENCODINGS_STR}")
 
         return normalized_encoding
 
@@ -239,11 +288,7 @@ class ParameterConverter:
             return False
 
         # 检查是否包含不可打印字符（除了常见的换行符和回车符）
-        import string
-        allowed_control_chars = {'\n', '\r', '\t'}
-        all_chars_printable = all(c in string.printable or c in allowed_control_chars for c in stop_pattern)
-
-        return all_chars_printable
+        return not stop_pattern.translate(_STOP_PATTERN_DEL_TABLE)
 
     def normalize_hex_payload(self, payload: str) -> str:
         """
@@ -259,7 +304,7 @@ class ParameterConverter:
             raise InvalidInputError(f"负载必须是字符串类型，当前类型: {type(payload)}")
 
         # 移除空格和分隔符，只保留十六进制字符
-        hex_part = re.sub(r'[^0-9a-fA-F]', '', payload)
+        hex_part = _strip_non_hex(payload)
 
         # 如果长度为奇数，前面补0
         if len(hex_part) % 2 != 0:
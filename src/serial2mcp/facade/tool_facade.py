@@ -8,6 +8,11 @@ from ..driver.serial_driver import SerialDriver
 from ..tools.connection import ConnectionTool
 from ..tools.communication import CommunicationTool
 from ..tools.async_message import AsyncMessageTool
+from ..tools.base import tool_method
+
+
+# 模块级日志记录器，所有实例共享同一个绑定，避免每次实例化重复创建
+_logger = get_logger("serial_tool_facade")
 
 
 class SerialToolFacade:
@@ -18,7 +23,7 @@ class SerialToolFacade:
 
     def __init__(self):
         """初始化工具门面"""
-        self.logger = get_logger("serial_tool_facade")
+        self.logger = _logger
         self.driver = SerialDriver()
 
         # 初始化各个工具模块
@@ -68,15 +73,23 @@ class SerialToolFacade:
         """
         return self.communication_tool.send_data(**kwargs)
 
-    def read_async_messages(self) -> Dict[str, Any]:
+    def read_async_messages(self, **kwargs) -> Dict[str, Any]:
         """
         读取后台缓冲区中积累的异步消息
 
+        Args:
+            **kwargs: 读取参数，包括 max_items
+
         Returns:
             异步消息列表的字典
         """
-        return self.async_message_tool.read_async_messages()
+        return self.async_message_tool.read_async_messages(kwargs.get('max_items'))
+
+    def handle_exception(self, e: Exception) -> Dict[str, Any]:
+        """统一异常处理，复用工具模块的异常处理器"""
+        return self.connection_tool.handle_exception(e)
 
+    @tool_method("获取驱动状态失败")
     def get_driver_status(self) -> Dict[str, Any]:
         """
         获取驱动状态
@@ -84,15 +97,13 @@ class SerialToolFacade:
         Returns:
             驱动状态信息字典
         """
-        try:
-            status = self.driver.get_driver_status()
-            return {
-                'success': True,
-                'data': status
-            }
-        except Exception as e:
-            return self.connection_tool.handle_exception(e)
+        status = self.driver.get_driver_status()
+        return {
+            'success': True,
+            'data': status
+        }
 
+    @tool_method("获取性能指标失败")
     def get_performance_metrics(self) -> Dict[str, Any]:
         """
         获取性能指标
@@ -100,11 +111,8 @@ class SerialToolFacade:
         Returns:
             性能指标字典
         """
-        try:
-            metrics = self.driver.get_performance_metrics()
-            return {
-                'success': True,
-                'data': metrics
-            }
-        except Exception as e:
-            return self.connection_tool.handle_exception(e)
\ No newline at end of file
+        metrics = self.driver.get_performance_metrics()
+        return {
+            'success': True,
+            'data': metrics
+        }
@@ -3,7 +3,11 @@ MCP 服务器入口点文件
 负责启动和运行 MCP 服务器
 """
 import asyncio
+import functools
+import json
+import signal
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from mcp.server.lowlevel import Server
 from mcp.server.stdio import stdio_server
 from mcp.server.models import InitializationOptions
@@ -12,7 +16,121 @@ from .utils.logger import setup_logging, get_logger
 from .utils.config import config_manager
 from .utils.serial_data_logger import serial_data_logger_manager
 import mcp.types as types
-import atexit
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def _json_default(obj):
+    """JSON 序列化兜底：字节数据转为十六进制字符串，其他对象转为字符串"""
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    return str(obj)
+
+
+def _result_to_text(result: dict) -> str:
+    """
+    将工具调用结果序列化为 JSON 文本，优先使用 orjson
+
+    Args:
+        result: 工具调用结果字典
+
+    Returns:
+        JSON 字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(result, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(result, default=_json_default, ensure_ascii=False)
+
+
+# 工具定义是静态的，在模块导入时构建一次，list_tools 请求直接返回缓存结果
+_TOOLS = [
+    types.Tool(
+        name="list_ports",
+        description="列出当前系统所有可用的串口设备。",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    types.Tool(
+        name="configure_connection",
+        description="打开或关闭串口，配置参数。",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "port": {
+                    "type": "string",
+                    "description": "串口设备路径"
+                },
+                "baudrate": {
+                    "type": "integer",
+                    "description": "波特率"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "超时时间"
+                },
+                "action": {
+                    "type": "string",
+                    "enum": ["open", "close"],
+                    "description": "操作类型：'open'打开串口，'close'关闭串口"
+                }
+            },
+            "required": ["action"]
+        }
+    ),
+    types.Tool(
+        name="send_data",
+        description="发送数据并根据策略获取响应。",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "payload": {
+                    "type": "string",
+                    "description": "发送内容"
+                },
+                "encoding": {
+                    "type": "string",
+                    "enum": ["utf8", "hex"],
+                    "description": "编码格式：'utf8'或'hex'"
+                },
+                "wait_policy": {
+                    "type": "string",
+                    "enum": ["keyword", "timeout", "none"],
+                    "description": "等待策略：'keyword'关键字等待模式，'timeout'纯时间等待模式，'none'射后不理模式"
+                },
+                "stop_pattern": {
+                    "type": "string",
+                    "description": "仅在 keyword 模式下有效（如 'OK'）"
+                },
+                "timeout_ms": {
+                    "type": "integer",
+                    "description": "等待超时时间（毫秒）"
+                }
+            },
+            "required": ["payload", "wait_policy"]
+        }
+    ),
+    types.Tool(
+        name="read_async_messages",
+        description="读取后台缓冲区中积累的异步消息。",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "max_items": {
+                    "type": "integer",
+                    "description": "单次最多读取的消息条数，不指定则全部读取；剩余条数见返回的 pending_async_count"
+                }
+            },
+            "required": []
+        }
+    )
+]
+_LIST_TOOLS_RESULT = types.ListToolsResult(tools=_TOOLS)
 
 
 async def main():
@@ -36,6 +154,18 @@ async def main():
     # 创建工具门面实例
     facade = SerialToolFacade()
 
+    # 串口读写会阻塞（关键字等待最长可达数秒），放到工作线程中执行以免阻塞事件循环；
+    # 驱动的同步模式是全局状态，因此只用一个工作线程，保证工具调用依次执行
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serial")
+
+    # 工具名 -> 处理函数，调用时以关键字参数传入工具参数
+    tool_handlers = {
+        "list_ports": lambda **_: facade.list_ports(),
+        "configure_connection": facade.configure_connection,
+        "send_data": facade.send_data,
+        "read_async_messages": facade.read_async_messages,
+    }
+
     # 创建MCP服务器
     server = Server(
         name="serial-agent-mcp",
@@ -43,9 +173,9 @@ async def main():
         instructions="智能串口 MCP 工具，用于与串口设备通信"
     )
 
-    # 注册退出时的清理函数
+    # 服务器退出时的清理函数
     def cleanup_resources():
-        """在程序退出时清理资源"""
+        """在服务器退出时清理资源"""
         try:
             # 停止所有串口通信日志记录
             serial_data_logger_manager.stop_all_logging()
@@ -53,107 +183,29 @@ async def main():
         except Exception as e:
             print(f"清理资源时出错: {e}", file=sys.stderr)
 
-    atexit.register(cleanup_resources)
+    # 收到终止信号时结束服务器主循环，进入正常的清理流程
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows 事件循环不支持信号处理器，仍由 KeyboardInterrupt 退出
+            pass
 
     # 定义并注册 list_tools 处理器
     @server.list_tools()
     async def handle_list_tools(request: types.ListToolsRequest) -> types.ListToolsResult:
         """处理 list_tools 请求"""
-        tools = [
-            types.Tool(
-                name="list_ports",
-                description="列出当前系统所有可用的串口设备。",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="configure_connection",
-                description="打开或关闭串口，配置参数。",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "port": {
-                            "type": "string",
-                            "description": "串口设备路径"
-                        },
-                        "baudrate": {
-                            "type": "integer",
-                            "description": "波特率"
-                        },
-                        "timeout": {
-                            "type": "number",
-                            "description": "超时时间"
-                        },
-                        "action": {
-                            "type": "string",
-                            "enum": ["open", "close"],
-                            "description": "操作类型：'open'打开串口，'close'关闭串口"
-                        }
-                    },
-                    "required": ["action"]
-                }
-            ),
-            types.Tool(
-                name="send_data",
-                description="发送数据并根据策略获取响应。",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "payload": {
-                            "type": "string",
-                            "description": "发送内容"
-                        },
-                        "encoding": {
-                            "type": "string",
-                            "enum": ["utf8", "hex"],
-                            "description": "编码格式：'utf8'或'hex'"
-                        },
-                        "wait_policy": {
-                            "type": "string",
-                            "enum": ["keyword", "timeout", "none"],
-                            "description": "等待策略：'keyword'关键字等待模式，'timeout'纯时间等待模式，'none'射后不理模式"
-                        },
-                        "stop_pattern": {
-                            "type": "string",
-                            "description": "仅在 keyword 模式下有效（如 'OK'）"
-                        },
-                        "timeout_ms": {
-                            "type": "integer",
-                            "description": "等待超时时间（毫秒）"
-                        }
-                    },
-                    "required": ["payload", "wait_policy"]
-                }
-            ),
-            types.Tool(
-                name="read_async_messages",
-                description="读取后台缓冲区中积累的异步消息。",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            )
-        ]
-        return types.ListToolsResult(tools=tools)
+        return _LIST_TOOLS_RESULT
 
     # 定义并注册 call_tool 处理器
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict):
         """处理 call_tool 请求"""
         try:
-            if name == "list_ports":
-                result = facade.list_ports()
-            elif name == "configure_connection":
-                result = facade.configure_connection(**arguments)
-            elif name == "send_data":
-                result = facade.send_data(**arguments)
-            elif name == "read_async_messages":
-                result = facade.read_async_messages()
-            else:
+            handler = tool_handlers.get(name)
+            if handler is None:
                 return [
                     types.TextContent(
                         type="text",
@@ -161,23 +213,15 @@ async def main():
                     )
                 ], {"success": False, "error": f"未知工具: {name}"}
 
-            # 将结果包装为适当的MCP内容格式
-            if result.get("success", True):
-                # 成功时返回内容
-                return [
-                    types.TextContent(
-                        type="text",
-                        text=str(result)
-                    )
-                ], result
-            else:
-                # 失败时返回错误消息
-                return [
-                    types.TextContent(
-                        type="text",
-                        text=f"错误: {result.get('error_message', '未知错误')}"
-                    )
-                ], result
+            result = await loop.run_in_executor(executor, functools.partial(handler, **arguments))
+
+            # 将结果（成功或失败）序列化为JSON文本，包装为MCP内容格式
+            return [
+                types.TextContent(
+                    type="text",
+                    text=_result_to_text(result)
+                )
+            ], result
         except Exception as e:
             error_content = {
                 "success": False,
@@ -195,13 +239,29 @@ async def main():
         experimental_capabilities={}
     )
 
-    # 启动服务器，使用stdio协议
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            init_options
-        )
+    # 启动服务器，使用stdio协议；服务器结束（客户端断开）或收到终止信号时退出
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            server_task = asyncio.create_task(server.run(
+                read_stream,
+                write_stream,
+                init_options
+            ))
+            stop_task = asyncio.create_task(stop_event.wait())
+            done, pending = await asyncio.wait(
+                {server_task, stop_task},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if server_task in done:
+                # 传播服务器异常
+                server_task.result()
+    finally:
+        # 在事件循环仍在运行时完成日志文件的刷新和关闭
+        await loop.run_in_executor(None, cleanup_resources)
+        executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
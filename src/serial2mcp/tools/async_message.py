@@ -2,33 +2,39 @@
 异步消息处理工具
 负责处理设备主动上报的消息
 """
-from typing import Dict, Any
-from .base import BaseTool
+from typing import Dict, Any, Optional
+from .base import BaseTool, tool_method
+from ..utils.exceptions import InvalidInputError
 
 
 class AsyncMessageTool(BaseTool):
     """异步消息处理工具"""
 
-    def read_async_messages(self) -> Dict[str, Any]:
+    __slots__ = ()
+
+    @tool_method("读取异步消息失败")
+    def read_async_messages(self, max_items: Optional[int] = None) -> Dict[str, Any]:
         """
         读取后台缓冲区中积累的异步消息
 
+        Args:
+            max_items: 单次最多读取的消息条数，None表示全部读取
+
         Returns:
-            异步消息列表的字典
+            异步消息列表的字典，pending_async_count为仍留在队列中的消息数
         """
-        try:
-            async_messages = self.driver.get_async_messages(clear=True)
-
-            result = {
-                'success': True,
-                'data': async_messages,
-                'count': len(async_messages)
-            }
+        # bool 是 int 的子类，需单独排除，避免 True 被当作 1 处理
+        if max_items is not None and (isinstance(max_items, bool) or not isinstance(max_items, int) or max_items <= 0):
+            raise InvalidInputError(f"max_items 必须为正整数，当前值: {max_items}")
 
-            self.logger.info(f"读取到 {len(async_messages)} 条异步消息")
+        async_messages = self.driver.get_async_messages(clear=True, max_items=max_items)
+        count = len(async_messages)
 
-            return result
+        self.logger.info(f"读取到 {count} 条异步消息")
 
-        except Exception as e:
-            self.logger.error(f"读取异步消息失败: {e}")
-            return self.handle_exception(e)
\ No newline at end of file
+        return {
+            'success': True,
+            'data': async_messages,
+            'count': count,
+            'pending_async_count': self.driver.get_pending_async_count()
+        }
@@ -2,24 +2,75 @@
 基础工具类定义
 包含所有 MCP 工具的基类和通用功能
 """
-from typing import Dict, Any
+import functools
+from typing import Dict, Any, Callable
 from ..utils.logger import get_logger
 from ..utils.exceptions import SerialConnectionError, SerialDataError, InvalidInputError
 from ..driver.serial_driver import SerialDriver
 
+# 按工具类名缓存的日志记录器
+_LOGGER_CACHE: Dict[str, Any] = {}
+# 各工具共用的 (参数转换器, 异常处理器)，首次创建工具时初始化
+_shared_helpers = None
+
+
+def _get_shared_helpers() -> tuple:
+    """
+    获取工具共用的参数转换器和异常处理器实例
+
+    Returns:
+        (ParameterConverter, ExceptionHandler) 元组
+    """
+    global _shared_helpers
+    if _shared_helpers is None:
+        # 延迟导入以避免循环导入
+        from ..facade.parameter_converter import ParameterConverter
+        from ..facade.exception_handler import ExceptionHandler
+        _shared_helpers = (ParameterConverter(), ExceptionHandler())
+    return _shared_helpers
+
+
+def tool_method(error_message: str) -> Callable:
+    """
+    工具方法装饰器：统一捕获异常，记录错误日志并转换为标准错误响应
+
+    被装饰方法所属对象需提供 logger 和 handle_exception
+
+    Args:
+        error_message: 记录错误日志时使用的描述
+
+    Returns:
+        装饰器
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs) -> Dict[str, Any]:
+            try:
+                return func(self, *args, **kwargs)
+            except Exception as e:
+                self.logger.error(f"{error_message}: {e}")
+                return self.handle_exception(e)
+        return wrapper
+    return decorator
+
 
 class BaseTool:
     """MCP工具基类"""
 
+    # 工具实例随门面长期存在，属性集合固定，使用__slots__省去实例__dict__
+    __slots__ = ('driver', 'logger', 'converter', 'exception_handler')
+
     def __init__(self, driver: SerialDriver):
         self.driver = driver
-        self.logger = get_logger(self.__class__.__name__.lower())
 
-        # 延迟导入以避免循环导入
-        from ..facade.parameter_converter import ParameterConverter
-        from ..facade.exception_handler import ExceptionHandler
-        self.converter = ParameterConverter()
-        self.exception_handler = ExceptionHandler()
+        name = type(self).__name__.lower()
+        logger = _LOGGER_CACHE.get(name)
+        if logger is None:
+            logger = _LOGGER_CACHE.setdefault(name, get_logger(name))
+        self.logger = logger
+
+        # 参数转换器和异常处理器不持有工具相关状态，所有工具共用同一实例
+        self.converter, self.exception_handler = _get_shared_helpers()
 
     def handle_exception(self, e: Exception) -> Dict[str, Any]:
         """统一异常处理"""
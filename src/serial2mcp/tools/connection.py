@@ -2,14 +2,33 @@
 连接管理工具
 负责串口设备的连接和断开操作
 """
-from typing import Dict, Any
-from .base import BaseTool
+import os
+import time
+from typing import Dict, Any, List, Optional
+from serial.tools import list_ports as _list_ports
+from .base import BaseTool, tool_method
 from ..utils.exceptions import InvalidInputError
 
+# 串口列表缓存有效期(秒)，客户端轮询时避免反复枚举系统设备
+# 可通过环境变量 SERIAL_LIST_PORTS_TTL 调整，设为 0 即关闭缓存；取值无效时使用默认值，不影响服务启动
+_DEFAULT_PORTS_CACHE_TTL = 0.5
+try:
+    _PORTS_CACHE_TTL = float(os.getenv('SERIAL_LIST_PORTS_TTL', _DEFAULT_PORTS_CACHE_TTL))
+except ValueError:
+    _PORTS_CACHE_TTL = _DEFAULT_PORTS_CACHE_TTL
+
 
 class ConnectionTool(BaseTool):
     """串口连接管理工具"""
 
+    __slots__ = ('_ports_cache', '_ports_cache_ts')
+
+    def __init__(self, driver):
+        super().__init__(driver)
+        self._ports_cache: Optional[List[Dict[str, Any]]] = None
+        self._ports_cache_ts = 0.0
+
+    @tool_method("配置串口连接失败")
     def configure_connection(self, **kwargs) -> Dict[str, Any]:
         """
         打开或关闭串口，配置参数
@@ -20,41 +39,39 @@ class ConnectionTool(BaseTool):
         Returns:
             操作结果字典
         """
-        try:
-            # 解析参数
-            action = kwargs.get('action')
-            port = kwargs.get('port')
-            baudrate = kwargs.get('baudrate')
-
-            if not action:
-                raise InvalidInputError("必须指定操作类型 (action)")
-
-            if action == 'open':
-                if not port:
-                    raise InvalidInputError("打开串口时必须指定端口 (port)")
-
-                self.driver.connect(port, baudrate)
-                return {
-                    'success': True,
-                    'message': f'串口 {port} 连接成功',
-                    'port': port,
-                    'baudrate': baudrate or self.driver.config.serial.baudrate
-                }
-
-            elif action == 'close':
-                self.driver.disconnect()
-                return {
-                    'success': True,
-                    'message': '串口连接已断开'
-                }
-
-            else:
-                raise InvalidInputError(f"无效的操作类型: {action}，支持的操作: open, close")
-
-        except Exception as e:
-            self.logger.error(f"配置串口连接失败: {e}")
-            return self.handle_exception(e)
+        # 解析参数
+        action = kwargs.get('action')
+        port = kwargs.get('port')
+        baudrate = kwargs.get('baudrate')
+
+        if not action:
+            raise InvalidInputError("必须指定操作类型 (action)")
+
+        if action == 'open':
+            if not port:
+                raise InvalidInputError("打开串口时必须指定端口 (port)")
+
+            self.driver.connect(port, baudrate)
+            # 打开串口后设备状态可能已变化（如热插拔），下次列出串口时重新枚举
+            self._ports_cache = None
+            return {
+                'success': True,
+                'message': f'串口 {port} 连接成功',
+                'port': port,
+                'baudrate': baudrate or self.driver.config.serial.baudrate
+            }
 
+        elif action == 'close':
+            self.driver.disconnect()
+            return {
+                'success': True,
+                'message': '串口连接已断开'
+            }
+
+        else:
+            raise InvalidInputError(f"无效的操作类型: {action}，支持的操作: open, close")
+
+    @tool_method("列出串口失败")
     def list_ports(self) -> Dict[str, Any]:
         """
         列出当前系统所有可用的串口设备
@@ -62,24 +79,28 @@ class ConnectionTool(BaseTool):
         Returns:
             包含串口列表的字典
         """
-        try:
-            import serial.tools.list_ports
-
-            ports = []
-            for port in serial.tools.list_ports.comports():
-                ports.append({
-                    'port': port.device,
-                    'description': port.description,
-                    'hardware_id': port.hwid
-                })
-
-            self.logger.info(f"找到 {len(ports)} 个串口设备")
-
+        now = time.monotonic()
+        if self._ports_cache is not None and now - self._ports_cache_ts < _PORTS_CACHE_TTL:
             return {
                 'success': True,
-                'data': ports
+                'data': [dict(port) for port in self._ports_cache]
             }
 
-        except Exception as e:
-            self.logger.error(f"列出串口失败: {e}")
-            return self.handle_exception(e)
\ No newline at end of file
+        ports = [
+            {
+                'port': port.device,
+                'description': port.description,
+                'hardware_id': port.hwid
+            }
+            for port in _list_ports.comports()
+        ]
+
+        self._ports_cache = ports
+        self._ports_cache_ts = now
+        self.logger.info(f"找到 {len(ports)} 个串口设备")
+
+        return {
+            'success': True,
+            # 返回副本，调用方修改结果不会影响缓存
+            'data': [dict(port) for port in ports]
+        }
@@ -3,13 +3,23 @@
 管理项目配置参数和默认值
 """
 import os
+import sys
 import json
+import threading
 from typing import Any, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
 
-@dataclass
+# 配置对象长期存在且字段固定，Python 3.10+ 生成 __slots__ 以省去实例 __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class SerialConfig:
     """串口配置数据类"""
     port: str = ""
@@ -23,7 +33,7 @@ class SerialConfig:
     dsrdtr: bool = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MCPConfig:
     """MCP协议配置数据类"""
     host: str = "127.0.0.1"
@@ -32,7 +42,7 @@ class MCPConfig:
     heartbeat_interval: float = 30.0  # 心跳间隔（秒）
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LoggingConfig:
     """日志配置数据类"""
     com_log_enabled: bool = True  # 启用串口通信日志
@@ -44,7 +54,7 @@ class LoggingConfig:
     level: str = "INFO"  # 日志级别
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DriverConfig:
     """驱动配置数据类"""
     idle_timeout: float = 0.1  # 空闲超时时间（秒）
@@ -55,7 +65,7 @@ class DriverConfig:
     reconnect_delay: float = 1.0  # 重连延迟时间
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AppConfig:
     """应用配置数据类"""
     serial: SerialConfig = None
@@ -74,6 +84,18 @@ class AppConfig:
             self.logging = LoggingConfig()
 
 
+# 配置文件中的节名(同AppConfig属性名) -> 配置数据类及其字段名集合
+_CONFIG_SECTIONS = tuple(
+    (name, cls, frozenset(f.name for f in fields(cls)))
+    for name, cls in (
+        ('serial', SerialConfig),
+        ('mcp', MCPConfig),
+        ('driver', DriverConfig),
+        ('logging', LoggingConfig),
+    )
+)
+
+
 class ConfigManager:
     """配置管理器"""
 
@@ -100,58 +122,17 @@ class ConfigManager:
             file_path: 配置文件路径
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # 加载串口配置
-            if 'serial' in data:
-                serial_data = data['serial']
-                self.config.serial = SerialConfig(
-                    port=serial_data.get('port', ''),
-                    baudrate=serial_data.get('baudrate', 115200),
-                    bytesize=serial_data.get('bytesize', 8),
-                    parity=serial_data.get('parity', 'N'),
-                    stopbits=serial_data.get('stopbits', 1),
-                    timeout=serial_data.get('timeout', 5.0),
-                    xonxoff=serial_data.get('xonxoff', False),
-                    rtscts=serial_data.get('rtscts', False),
-                    dsrdtr=serial_data.get('dsrdtr', False)
-                )
-
-            # 加载MCP配置
-            if 'mcp' in data:
-                mcp_data = data['mcp']
-                self.config.mcp = MCPConfig(
-                    host=mcp_data.get('host', '127.0.0.1'),
-                    port=mcp_data.get('port', 3000),
-                    max_connections=mcp_data.get('max_connections', 100),
-                    heartbeat_interval=mcp_data.get('heartbeat_interval', 30.0)
-                )
-
-            # 加载驱动配置
-            if 'driver' in data:
-                driver_data = data['driver']
-                self.config.driver = DriverConfig(
-                    idle_timeout=driver_data.get('idle_timeout', 0.1),
-                    max_buffer_size=driver_data.get('max_buffer_size', 4096),
-                    urc_buffer_size=driver_data.get('urc_buffer_size', 1000),
-                    sync_timeout_default=driver_data.get('sync_timeout_default', 5.0),
-                    reconnect_attempts=driver_data.get('reconnect_attempts', 3),
-                    reconnect_delay=driver_data.get('reconnect_delay', 1.0)
-                )
-
-            # 加载日志配置
-            if 'logging' in data:
-                log_data = data['logging']
-                self.config.logging = LoggingConfig(
-                    com_log_enabled=log_data.get('com_log_enabled', True),
-                    tool_log_enabled=log_data.get('tool_log_enabled', True),
-                    com_log_path=log_data.get('com_log_path', 'logs/com_log'),
-                    tool_log_path=log_data.get('tool_log_path', 'logs/tool_log'),
-                    retention_days=log_data.get('retention_days', 30),
-                    max_file_size_mb=log_data.get('max_file_size_mb', 10),
-                    level=log_data.get('level', 'INFO')
-                )
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+            # 按节加载配置，未知字段忽略，缺失字段使用数据类默认值
+            for section, config_cls, field_names in _CONFIG_SECTIONS:
+                if section in data:
+                    section_data = data[section]
+                    setattr(self.config, section, config_cls(
+                        **{k: v for k, v in section_data.items() if k in field_names}
+                    ))
 
         except Exception as e:
             print(f"从文件加载配置时出错: {e}")
@@ -231,5 +212,33 @@ class ConfigManager:
         return self.config
 
 
-# 全局配置管理器实例
-config_manager = ConfigManager()
\ No newline at end of file
+class _LazyConfigManager:
+    """
+    全局配置管理器代理
+
+    首次访问属性时才创建 ConfigManager（读取环境变量或配置文件），
+    导入模块本身不做任何配置加载工作；调用方式与 ConfigManager 实例相同
+    """
+
+    __slots__ = ('_instance', '_lock')
+
+    def __init__(self):
+        self._instance: Optional[ConfigManager] = None
+        self._lock = threading.Lock()
+
+    def _get_instance(self) -> ConfigManager:
+        """获取（必要时创建）实际的配置管理器实例"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = ConfigManager()
+                instance = self._instance
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_instance(), name)
+
+
+# 全局配置管理器实例（延迟创建）
+config_manager = _LazyConfigManager()
\ No newline at end of file
@@ -3,13 +3,32 @@
 设置项目日志记录格式和级别
 """
 import structlog
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import json
 from typing import Any
 from datetime import datetime
 from pathlib import Path
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+# 文件日志的后台写入线程，重新配置日志时先停止旧的监听器
+_queue_listener = None
+
+
+def _json_dumps(obj: Any, default: Any = None, **kwargs: Any) -> str:
+    """JSON 日志序列化函数，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default).decode('utf-8')
+    return json.dumps(obj, default=default, ensure_ascii=False)
+
 
 def setup_logging(level: str = "INFO", format_type: str = "console", enable_file_logging: bool = True, log_dir: str = "logs/tool_log", disable_console: bool = True) -> None:
     """
@@ -29,17 +48,15 @@ def setup_logging(level: str = "INFO", format_type: str = "console", enable_file
 
     # 创建日志目录
     if enable_file_logging:
-        log_path = Path(log_dir)
-        date_path = log_path / datetime.now().strftime("%Y") / datetime.now().strftime("%m") / datetime.now().strftime("%d")
-        date_path.mkdir(parents=True, exist_ok=True)
+        # 只取一次当前时间，避免跨越零点时日期目录与文件名时间戳不一致
+        now = datetime.now()
+        date_path = Path(log_dir) / now.strftime("%Y") / now.strftime("%m") / now.strftime("%d")
+        os.makedirs(date_path, exist_ok=True)
 
         # 生成带时间戳的日志文件名
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         log_file_path = date_path / f"serial-agent-mcp_{timestamp}.log"
 
-        # 确保日志文件目录存在
-        log_file_path.parent.mkdir(parents=True, exist_ok=True)
-
     # 配置根日志记录器，可以选择性地输出到控制台或仅输出到文件
     handlers = []
 
@@ -50,7 +67,8 @@ def setup_logging(level: str = "INFO", format_type: str = "console", enable_file
             file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
             file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
             file_handler.setFormatter(file_formatter)
-            handlers.append(file_handler)
+            # 调用线程只负责入队，由后台线程写文件，避免磁盘I/O阻塞工具调用
+            handlers.append(_start_queue_listener(file_handler))
         except Exception as e:
             print(f"无法创建日志文件 {log_file_path}: {e}", file=sys.stderr)
             # 如果无法创建日志文件，仍然继续运行，但禁用文件日志
@@ -71,28 +89,22 @@ def setup_logging(level: str = "INFO", format_type: str = "console", enable_file
     )
 
     # 配置结构化日志，让structlog使用标准logging作为后端
+    # 日志级别由 make_filtering_bound_logger 在调用入口处过滤，被禁用级别不会执行任何处理器
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+    ]
     if format_type == "json":
         # JSON 格式日志配置
-        processors = [
-            structlog.contextvars.merge_contextvars,
-            structlog.stdlib.filter_by_level,
+        processors += [
             structlog.processors.TimeStamper(fmt="iso", utc=True),
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.UnicodeDecoder(),
             structlog.processors.format_exc_info,
-            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,  # 让structlog使用logging处理器
+            structlog.processors.JSONRenderer(serializer=_json_dumps),
         ]
     else:
         # 普通格式日志配置（避免颜色代码）
-        processors = [
-            structlog.contextvars.merge_contextvars,
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.UnicodeDecoder(),
+        processors += [
             structlog.processors.format_exc_info,
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,  # 让structlog使用logging处理器
         ]
@@ -102,12 +114,46 @@ def setup_logging(level: str = "INFO", format_type: str = "console", enable_file
         processors=processors,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
         cache_logger_on_first_use=True,
     )
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+def _start_queue_listener(handler: logging.Handler) -> logging.Handler:
+    """
+    启动后台线程，将日志记录转交给指定处理器
+
+    Args:
+        handler: 实际执行写入的日志处理器
+
+    Returns:
+        挂到根日志记录器上的队列处理器
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    else:
+        atexit.register(_stop_queue_listener)
+
+    log_queue = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _queue_listener.start()
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # 入队前只合并消息参数，最终格式由实际处理器决定（避免被basicConfig设置默认格式）
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    return queue_handler
+
+
+def _stop_queue_listener() -> None:
+    """停止后台日志线程，写完队列中剩余的日志"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def get_logger(name: str) -> Any:
     """
     获取结构化日志记录器
 
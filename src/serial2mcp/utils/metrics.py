@@ -2,15 +2,23 @@
 性能指标收集器
 监控和收集系统性能相关指标
 """
+import sys
 import time
 import threading
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, fields
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
 
-@dataclass
+# Python 3.10+ 生成 __slots__，字段读写走槽描述符
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PerformanceMetrics:
     """性能指标数据类"""
     # 串口相关指标
@@ -37,43 +45,149 @@ class PerformanceMetrics:
     last_update_time: float = 0.0
 
 
+# 导出指标时按字段名直接取值，避免 asdict() 的递归深拷贝
+_METRIC_FIELDS = tuple(f.name for f in fields(PerformanceMetrics))
+
+# 平均响应时间统计窗口（最近N次）
+_RESPONSE_WINDOW = 100
+
+# 按次数/字节累加的计数类指标
+_COUNTER_FIELDS = (
+    'bytes_sent',
+    'bytes_received',
+    'send_operations',
+    'receive_operations',
+    'errors',
+    'connection_timeouts',
+    'successful_connections',
+    'failed_connections',
+    'async_messages_processed',
+    'async_buffer_overflows',
+)
+
+
+class _CounterCell:
+    """单个线程独占的计数单元，只有所属线程写入，因此更新计数无需加锁"""
+
+    # last_update_ns 为单调时钟纳秒值，读取指标时再换算为墙上时间
+    __slots__ = _COUNTER_FIELDS + ('last_update_ns', 'owner')
+
+    def __init__(self, owner: Optional[threading.Thread] = None):
+        for name in _COUNTER_FIELDS:
+            setattr(self, name, 0)
+        self.last_update_ns = 0
+        self.owner = owner
+
+    def merge(self, other: '_CounterCell') -> None:
+        """
+        将另一个计数单元的计数累加到本单元
+
+        Args:
+            other: 要合并的计数单元
+        """
+        for name in _COUNTER_FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        if other.last_update_ns > self.last_update_ns:
+            self.last_update_ns = other.last_update_ns
+
+
 class MetricsCollector:
     """性能指标收集器"""
 
+    __slots__ = (
+        'metrics', 'start_time', '_start_ns', 'lock', '_init_time',
+        '_rt_buf', '_rt_idx', '_rt_count', '_rt_sum_ns',
+        '_tls', '_cells', '_cells_lock', '_retired', '_baseline',
+    )
+
     def __init__(self):
         """初始化性能指标收集器"""
         self.metrics = PerformanceMetrics()
         self.start_time = time.time()
-        self.response_times = deque(maxlen=100)  # 最近100次响应时间
+        # 运行时间按单调时钟计算，不受系统时间调整影响
+        self._start_ns = time.monotonic_ns()
+        # 最近N次响应时间(整数纳秒)的环形缓冲区及其累计和，平均值按增量更新；
+        # 整数累加不会像浮点增量更新那样累积舍入误差
+        self._rt_buf = [0] * _RESPONSE_WINDOW
+        self._rt_idx = 0
+        self._rt_count = 0
+        self._rt_sum_ns = 0
+        # 保护响应时间统计和重置基线；计数类指标写入各线程自己的计数单元，不经过该锁
         self.lock = threading.Lock()
         self._init_time = time.time()
 
-    def start_timer(self) -> float:
+        self._tls = threading.local()
+        self._cells: List[_CounterCell] = []
+        self._cells_lock = threading.Lock()  # 仅在注册和汇总计数单元时使用，不在记录路径上
+        self._retired = _CounterCell()  # 已退出线程的计数合并于此
+        self._baseline = dict.fromkeys(_COUNTER_FIELDS, 0)  # 上次重置时的计数快照
+
+    def _cell(self) -> _CounterCell:
+        """获取当前线程的计数单元，首次调用时创建并注册"""
+        try:
+            return self._tls.cell
+        except AttributeError:
+            cell = _CounterCell(threading.current_thread())
+            with self._cells_lock:
+                self._cells.append(cell)
+            self._tls.cell = cell
+            return cell
+
+    def _sum_counters(self) -> Tuple[Dict[str, int], int]:
+        """
+        汇总所有计数单元的累计值，同时将已退出线程的计数单元并入合并单元，避免单元列表无限增长
+
+        合并与求和在同一次加锁内完成：若在锁外求和，另一读取方可能在此期间把某个单元并入
+        合并单元，导致该单元被重复计数
+
+        Returns:
+            (各计数字段累计值字典, 最近一次更新的单调时钟纳秒值) 元组
+        """
+        with self._cells_lock:
+            live = []
+            for cell in self._cells:
+                if cell.owner.is_alive():
+                    live.append(cell)
+                else:
+                    # 线程已退出，不会再写入该单元，可安全合并
+                    self._retired.merge(cell)
+            self._cells = live
+            cells = live + [self._retired]
+            totals = {name: sum(getattr(cell, name) for cell in cells) for name in _COUNTER_FIELDS}
+            last_update_ns = max(cell.last_update_ns for cell in cells)
+        return totals, last_update_ns
+
+    def start_timer(self) -> int:
         """
         开始计时
 
         Returns:
-            开始时间戳
+            计时起点（perf_counter_ns 纳秒值，仅用于传给 end_timer）
         """
-        return time.time()
+        return time.perf_counter_ns()
 
-    def end_timer(self, start_time: float) -> float:
+    def end_timer(self, start_time: int) -> float:
         """
         结束计时并记录响应时间
 
         Args:
-            start_time: 开始时间戳
+            start_time: start_timer 返回的计时起点
 
         Returns:
             经过的时间（秒）
         """
-        elapsed = time.time() - start_time
+        elapsed_ns = time.perf_counter_ns() - start_time
         with self.lock:
-            self.response_times.append(elapsed)
-            # 更新平均响应时间
-            if self.response_times:
-                self.metrics.avg_response_time = sum(self.response_times) / len(self.response_times)
-        return elapsed
+            # 用新样本替换窗口中最旧的样本，并更新累计和
+            idx = self._rt_idx
+            self._rt_sum_ns += elapsed_ns - self._rt_buf[idx]
+            self._rt_buf[idx] = elapsed_ns
+            self._rt_idx = (idx + 1) % _RESPONSE_WINDOW
+            if self._rt_count < _RESPONSE_WINDOW:
+                self._rt_count += 1
+            # 更新平均响应时间（秒）
+            self.metrics.avg_response_time = self._rt_sum_ns / self._rt_count / 1e9
+        return elapsed_ns / 1e9
 
     def record_send(self, bytes_count: int) -> None:
         """
@@ -82,10 +196,10 @@ class MetricsCollector:
         Args:
             bytes_count: 发送的字节数
         """
-        with self.lock:
-            self.metrics.bytes_sent += bytes_count
-            self.metrics.send_operations += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        cell.bytes_sent += bytes_count
+        cell.send_operations += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def record_receive(self, bytes_count: int) -> None:
         """
@@ -94,16 +208,16 @@ class MetricsCollector:
         Args:
             bytes_count: 接收的字节数
         """
-        with self.lock:
-            self.metrics.bytes_received += bytes_count
-            self.metrics.receive_operations += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        cell.bytes_received += bytes_count
+        cell.receive_operations += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def record_error(self) -> None:
         """记录错误"""
-        with self.lock:
-            self.metrics.errors += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        cell.errors += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def record_connection_attempt(self, success: bool) -> None:
         """
@@ -112,30 +226,30 @@ class MetricsCollector:
         Args:
             success: 连接是否成功
         """
-        with self.lock:
-            if success:
-                self.metrics.successful_connections += 1
-            else:
-                self.metrics.failed_connections += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        if success:
+            cell.successful_connections += 1
+        else:
+            cell.failed_connections += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def record_timeout(self) -> None:
         """记录超时"""
-        with self.lock:
-            self.metrics.connection_timeouts += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        cell.connection_timeouts += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def record_async_message(self) -> None:
         """记录异步消息处理"""
-        with self.lock:
-            self.metrics.async_messages_processed += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        cell.async_messages_processed += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def record_async_overflow(self) -> None:
         """记录异步消息缓冲区溢出"""
-        with self.lock:
-            self.metrics.async_buffer_overflows += 1
-            self.metrics.last_update_time = time.time()
+        cell = self._cell()
+        cell.async_buffer_overflows += 1
+        cell.last_update_ns = time.monotonic_ns()
 
     def get_uptime(self) -> float:
         """
@@ -144,7 +258,7 @@ class MetricsCollector:
         Returns:
             系统运行时间（秒）
         """
-        return time.time() - self.start_time
+        return (time.monotonic_ns() - self._start_ns) / 1e9
 
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -154,29 +268,46 @@ class MetricsCollector:
             性能指标字典
         """
         with self.lock:
+            # 累计值与基线须在同一临界区内读取，否则期间的重置会装入更大的基线，使差值为负
+            totals, last_update_ns = self._sum_counters()
+            # 本次快照中的各时间字段共用同一个当前时间
+            now = time.time()
+            if last_update_ns:
+                last_update = now - (time.monotonic_ns() - last_update_ns) / 1e9
+            else:
+                last_update = 0.0
+
+            for name in _COUNTER_FIELDS:
+                totals[name] -= self._baseline[name]
+                setattr(self.metrics, name, totals[name])
+            self.metrics.last_update_time = max(self.metrics.last_update_time, last_update)
             # 更新运行时间
             self.metrics.total_uptime = self.get_uptime()
-            metrics_dict = asdict(self.metrics)
-            # 添加额外的计算指标
-            metrics_dict['current_time'] = time.time()
-            if self.metrics.send_operations > 0:
-                metrics_dict['avg_bytes_per_send'] = self.metrics.bytes_sent / self.metrics.send_operations
-            else:
-                metrics_dict['avg_bytes_per_send'] = 0
+            metrics = self.metrics
+            metrics_dict = {name: getattr(metrics, name) for name in _METRIC_FIELDS}
 
-            if self.metrics.receive_operations > 0:
-                metrics_dict['avg_bytes_per_receive'] = self.metrics.bytes_received / self.metrics.receive_operations
-            else:
-                metrics_dict['avg_bytes_per_receive'] = 0
+        # 添加额外的计算指标
+        send_ops = totals['send_operations']
+        receive_ops = totals['receive_operations']
+        metrics_dict['current_time'] = now
+        metrics_dict['avg_bytes_per_send'] = totals['bytes_sent'] / send_ops if send_ops > 0 else 0
+        metrics_dict['avg_bytes_per_receive'] = totals['bytes_received'] / receive_ops if receive_ops > 0 else 0
 
-            return metrics_dict
+        return metrics_dict
 
     def reset_metrics(self) -> None:
         """重置所有指标"""
         with self.lock:
+            totals, _ = self._sum_counters()
+            # 计数单元由各线程独占写入，不直接清零，而是记录当前值作为新的基线
+            self._baseline = totals
             self.metrics = PerformanceMetrics()
-            self.response_times.clear()
+            self._rt_buf = [0] * _RESPONSE_WINDOW
+            self._rt_idx = 0
+            self._rt_count = 0
+            self._rt_sum_ns = 0
             self.start_time = time.time()
+            self._start_ns = time.monotonic_ns()
             self.metrics.last_update_time = time.time()
 
     def get_formatted_metrics(self) -> str:
@@ -187,6 +318,8 @@ class MetricsCollector:
             格式化的性能指标字符串
         """
         metrics = self.get_metrics()
+        if orjson is not None:
+            return orjson.dumps(metrics, option=orjson.OPT_INDENT_2).decode('utf-8')
         return json.dumps(metrics, indent=2, ensure_ascii=False)
 
 
@@ -3,15 +3,25 @@
 负责记录串口通信的原始数据到文件
 """
 import os
+import sys
 import time
+from collections import deque
 from datetime import datetime
-from typing import Optional, Union, BinaryIO
+from typing import Optional, Union, BinaryIO, Deque, Dict, List, Tuple
 import threading
 from pathlib import Path
+from .metrics import metrics_collector
 
 # 延迟导入以避免循环导入
 _config_manager = None
 
+# 后台写日志队列容量，队列满时丢弃新数据而不阻塞串口读写
+_LOG_QUEUE_SIZE = 8192
+# 持续有数据写入时，日志文件刷新到磁盘的最长间隔(秒)；队列空闲时立即刷新
+_LOG_FLUSH_INTERVAL = 0.5
+# 字符串格式日志中需要转义显示的控制字符
+_ESCAPE_TABLE = str.maketrans({'\r': '\\r', '\n': '\\n', '\t': '\\t'})
+
 
 class SerialDataLogger:
     """
@@ -19,6 +29,9 @@ class SerialDataLogger:
     记录串口通信的原始数据，支持HEX和字符串两种格式
     """
 
+    # 已创建的日期子目录: (日志根目录, 年, 月, 日) -> 路径，所有串口共用
+    _date_dir_cache: Dict[Tuple[Path, int, int, int], Path] = {}
+
     def __init__(self, port_name: str, log_dir: str = "logs/com_log"):
         """
         初始化串口数据日志记录器
@@ -34,6 +47,10 @@ class SerialDataLogger:
         self.file_lock = threading.Lock()  # 确保文件操作线程安全
         self.is_logging = False
 
+        # 时间戳前缀缓存：同一秒内的日志条目只格式化一次日期时间部分
+        # (秒, 格式化前缀) 作为整体替换，多线程调用时不会读到不匹配的一对
+        self._ts_cache: Tuple[Optional[int], str] = (None, "")
+
         # 创建日志目录
         self.log_dir.mkdir(parents=True, exist_ok=True)
     
@@ -44,28 +61,22 @@ class SerialDataLogger:
                 return
 
             # 生成带时间戳的文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             hex_filename = f"{self.port_name}_{timestamp}.hex"
             txt_filename = f"{self.port_name}_{timestamp}.txt"
 
-            # 创建日期子目录
-            date_dir = self.log_dir / datetime.now().strftime("%Y") / datetime.now().strftime("%m") / datetime.now().strftime("%d")
-            date_dir.mkdir(parents=True, exist_ok=True)
-
-            # 确保目录路径存在
-            date_dir.parent.mkdir(parents=True, exist_ok=True)
+            # 创建日期子目录，同一天内只创建一次
+            date_dir = self._get_date_dir(now)
 
             # 打开日志文件
             self.hex_file_path = date_dir / hex_filename
             self.txt_file_path = date_dir / txt_filename
 
-            # 确保文件路径的父目录存在
-            self.hex_file_path.parent.mkdir(parents=True, exist_ok=True)
-            self.txt_file_path.parent.mkdir(parents=True, exist_ok=True)
-
             try:
-                self.hex_file = open(self.hex_file_path, 'a', encoding='utf-8')
-                self.txt_file = open(self.txt_file_path, 'a', encoding='utf-8')
+                # 二进制模式写入预先编码好的字节，省去 TextIOWrapper 的逐次编码
+                self.hex_file = open(self.hex_file_path, 'ab')
+                self.txt_file = open(self.txt_file_path, 'ab')
             except Exception as e:
                 print(f"无法创建日志文件 {self.hex_file_path} 或 {self.txt_file_path}: {e}", file=sys.stderr)
                 raise
@@ -74,14 +85,33 @@ class SerialDataLogger:
 
             # 记录开始日志
             start_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            hex_start_entry = f"[{start_time_str}] *** LOG START ***\n"
-            txt_start_entry = f"[{start_time_str}] *** LOG START ***\n"
+            hex_start_entry = f"[{start_time_str}] *** LOG START ***\n".encode('utf-8')
+            txt_start_entry = f"[{start_time_str}] *** LOG START ***\n".encode('utf-8')
 
             self.hex_file.write(hex_start_entry)
             self.txt_file.write(txt_start_entry)
             self.hex_file.flush()
             self.txt_file.flush()
     
+    def _get_date_dir(self, now: datetime) -> Path:
+        """
+        获取当天的日志子目录 (年/月/日)，按日期缓存，仅在目录不存在时创建
+
+        Args:
+            now: 当前时间
+
+        Returns:
+            日期子目录路径
+        """
+        key = (self.log_dir, now.year, now.month, now.day)
+        date_dir = self._date_dir_cache.get(key)
+        # 目录可能被外部清理脚本删除，缓存命中时仍做一次 stat 确认
+        if date_dir is None or not date_dir.is_dir():
+            date_dir = self.log_dir / now.strftime("%Y") / now.strftime("%m") / now.strftime("%d")
+            date_dir.mkdir(parents=True, exist_ok=True)
+            self._date_dir_cache[key] = date_dir
+        return date_dir
+
     def stop_logging(self) -> None:
         """停止记录日志"""
         with self.file_lock:
@@ -90,8 +120,8 @@ class SerialDataLogger:
             
             # 记录结束日志
             end_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            hex_end_entry = f"[{end_time_str}] *** LOG END ***\n"
-            txt_end_entry = f"[{end_time_str}] *** LOG END ***\n"
+            hex_end_entry = f"[{end_time_str}] *** LOG END ***\n".encode('utf-8')
+            txt_end_entry = f"[{end_time_str}] *** LOG END ***\n".encode('utf-8')
             
             if self.hex_file:
                 self.hex_file.write(hex_end_entry)
@@ -107,42 +137,84 @@ class SerialDataLogger:
             
             self.is_logging = False
     
-    def log_data(self, direction: str, data: bytes) -> None:
+    def log_data(self, direction: str, data: bytes, timestamp: Optional[float] = None) -> None:
         """
         记录数据到日志文件
 
         Args:
             direction: 数据流向 ('TX' 或 'RX')
             data: 要记录的字节数据
+            timestamp: 数据产生时间(time.time())，为None时取当前时间
+        """
+        self.log_entries([(direction, data, timestamp if timestamp is not None else time.time())])
+
+    def log_entries(self, entries: List[Tuple[str, bytes, float]]) -> None:
+        """
+        批量记录数据到日志文件，每个文件只写入一次，刷新由调用方通过 flush() 控制
+
+        Args:
+            entries: (数据流向, 字节数据, 时间戳) 列表
         """
-        if not self.is_logging or not data:
+        if not self.is_logging:
+            return
+
+        # 各片段直接收集到列表中，写入前只做一次 join，不为每行拼接中间字符串
+        hex_parts = []
+        txt_parts = []
+        for direction, data, ts in entries:
+            if not data:
+                continue
+
+            # 行首 "[时间戳] 方向 -> " 在两个文件间共用，只格式化一次
+            prefix = f"[{self._format_timestamp(ts)}] {direction} -> "
+
+            # 记录HEX格式
+            hex_parts.extend((prefix, data.hex(' ').upper(), "\n"))
+
+            # 记录字符串格式，确保特殊字符在字符串中正确显示
+            str_data = data.decode('utf-8', errors='replace').translate(_ESCAPE_TABLE)
+            txt_parts.extend((prefix, str_data, "\n"))
+
+        if not hex_parts:
             return
-        
+
         with self.file_lock:
             if not self.hex_file or not self.txt_file:
                 return
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            
-            # 记录HEX格式
-            hex_data = " ".join([f"{b:02X}" for b in data])
-            hex_entry = f"[{timestamp}] {direction} -> {hex_data}\n"
-            self.hex_file.write(hex_entry)
-            
-            # 记录字符串格式
-            try:
-                str_data = data.decode('utf-8', errors='replace')
-                # 确保特殊字符在字符串中正确显示
-                str_data = str_data.replace('\r', '\\r').replace('\n', '\\n').replace('\t', '\\t')
-            except:
-                str_data = repr(data)[1:-1]  # 使用repr并去除引号
-            txt_entry = f"[{timestamp}] {direction} -> {str_data}\n"
-            self.txt_file.write(txt_entry)
-            
-            # 立即刷新确保数据写入
-            self.hex_file.flush()
-            self.txt_file.flush()
-    
+
+            self.hex_file.write("".join(hex_parts).encode('ascii'))
+            self.txt_file.write("".join(txt_parts).encode('utf-8'))
+
+    def _format_timestamp(self, ts: float) -> str:
+        """
+        将时间戳格式化为 "YYYY-mm-dd HH:MM:SS.mmm"，秒级部分按秒缓存
+
+        Args:
+            ts: time.time() 时间戳
+
+        Returns:
+            格式化后的时间字符串
+        """
+        sec = int(ts)
+        # 与 datetime.fromtimestamp 一致：微秒四舍五入后再截断到毫秒
+        us = round((ts - sec) * 1e6)
+        if us >= 1000000:
+            sec += 1
+            us -= 1000000
+        cache = self._ts_cache
+        if cache[0] != sec:
+            cache = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
+            self._ts_cache = cache
+        return f"{cache[1]}.{us // 1000:03d}"
+
+    def flush(self) -> None:
+        """将已写入的日志数据刷新到磁盘"""
+        with self.file_lock:
+            if self.hex_file:
+                self.hex_file.flush()
+            if self.txt_file:
+                self.txt_file.flush()
+
     def __del__(self):
         """析构函数，确保日志文件被关闭"""
         self.stop_logging()
@@ -157,6 +229,19 @@ class SerialDataLoggerManager:
     def __init__(self):
         self.loggers = {}
         self.lock = threading.Lock()
+        # 串口读写线程只负责入队，由后台线程格式化并写文件
+        self._pending: Deque[Tuple[str, str, bytes, float]] = deque()
+        # 两个条件变量共用一把锁：not_empty 唤醒后台线程，all_done 唤醒 flush() 等待方
+        self._pending_lock = threading.Lock()
+        self._not_empty = threading.Condition(self._pending_lock)
+        self._all_done = threading.Condition(self._pending_lock)
+        # 已入队但尚未写完的条目数
+        self._unfinished = 0
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.dropped = 0
+        # 当前是否处于队列溢出期间，每次溢出只告警一次
+        self._overflowing = False
 
     def get_logger(self, port_name: str) -> SerialDataLogger:
         """
@@ -168,6 +253,11 @@ class SerialDataLoggerManager:
         Returns:
             串口数据日志记录器实例
         """
+        # 常见情况下记录器已存在，dict.get 在 GIL 下是原子的，无需加锁
+        logger = self.loggers.get(port_name)
+        if logger is not None:
+            return logger
+
         # 从配置中动态获取日志路径
         global _config_manager
         if _config_manager is None:
@@ -177,9 +267,11 @@ class SerialDataLoggerManager:
         config = _config_manager.get_config()
 
         with self.lock:
-            if port_name not in self.loggers:
-                self.loggers[port_name] = SerialDataLogger(port_name, config.logging.com_log_path)
-            return self.loggers[port_name]
+            logger = self.loggers.get(port_name)
+            if logger is None:
+                logger = SerialDataLogger(port_name, config.logging.com_log_path)
+                self.loggers[port_name] = logger
+            return logger
     
     def start_logging(self, port_name: str) -> None:
         """
@@ -198,6 +290,7 @@ class SerialDataLoggerManager:
         Args:
             port_name: 串口名称
         """
+        self.flush()
         with self.lock:
             if port_name in self.loggers:
                 self.loggers[port_name].stop_logging()
@@ -205,18 +298,96 @@ class SerialDataLoggerManager:
     
     def log_data(self, port_name: str, direction: str, data: bytes) -> None:
         """
-        记录指定串口的数据
+        记录指定串口的数据，仅入队不阻塞调用方
 
         Args:
             port_name: 串口名称
             direction: 数据流向 ('TX' 或 'RX')
             data: 要记录的字节数据
         """
-        logger = self.get_logger(port_name)
-        logger.log_data(direction, data)
-    
+        if not data:
+            return
+
+        if self._worker is None:
+            self._start_worker()
+
+        item = (port_name, direction, bytes(data), time.time())
+        with self._not_empty:
+            # 队列满时丢弃新数据，不阻塞串口读写线程
+            if len(self._pending) >= _LOG_QUEUE_SIZE:
+                self.dropped += 1
+                metrics_collector.record_async_overflow()
+                if not self._overflowing:
+                    self._overflowing = True
+                    print(f"串口数据日志队列已满 ({_LOG_QUEUE_SIZE} 条)，新数据将被丢弃", file=sys.stderr)
+                return
+            if self._overflowing:
+                self._overflowing = False
+                print(f"串口数据日志队列已恢复，累计丢弃 {self.dropped} 条", file=sys.stderr)
+            self._pending.append(item)
+            self._unfinished += 1
+            self._not_empty.notify()
+
+    def flush(self) -> None:
+        """等待后台线程写完所有已入队的数据"""
+        if self._worker is not None and self._worker.is_alive():
+            with self._all_done:
+                while self._unfinished:
+                    self._all_done.wait()
+
+    def _start_worker(self) -> None:
+        """延迟启动后台写日志线程"""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="SerialDataLoggerWorker",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """后台线程主循环：一次取出全部待写日志条目，按串口分组后写入文件"""
+        pending = self._pending
+        not_empty = self._not_empty
+        # 已写入但尚未刷新的日志记录器
+        pending_flush: Dict[str, SerialDataLogger] = {}
+        last_flush = time.monotonic()
+        while True:
+            with not_empty:
+                while not pending:
+                    not_empty.wait()
+                batch = list(pending)
+                pending.clear()
+
+            try:
+                by_port: Dict[str, List[Tuple[str, bytes, float]]] = {}
+                for port_name, direction, data, ts in batch:
+                    by_port.setdefault(port_name, []).append((direction, data, ts))
+
+                for port_name, entries in by_port.items():
+                    logger = self.get_logger(port_name)
+                    logger.log_entries(entries)
+                    pending_flush[port_name] = logger
+
+                # 队列空闲或距上次刷新超过间隔时才刷新，持续大流量时合并多批次写入
+                now = time.monotonic()
+                if not pending or now - last_flush >= _LOG_FLUSH_INTERVAL:
+                    for logger in pending_flush.values():
+                        logger.flush()
+                    pending_flush.clear()
+                    last_flush = now
+            except Exception as e:
+                print(f"写入串口数据日志失败: {e}", file=sys.stderr)
+            finally:
+                with self._all_done:
+                    self._unfinished -= len(batch)
+                    if not self._unfinished:
+                        self._all_done.notify_all()
+
     def stop_all_logging(self) -> None:
         """停止所有串口的日志记录"""
+        self.flush()
         with self.lock:
             for logger in list(self.loggers.values()):
                 logger.stop_logging()
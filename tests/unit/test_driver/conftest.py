@@ -0,0 +1,27 @@
+"""
+串口驱动测试共用夹具
+"""
+import pytest
+from unittest.mock import patch
+from serial2mcp.driver.serial_driver import SerialDriver
+
+
+@pytest.fixture
+def mocked_driver():
+    """已初始化且依赖组件均被模拟的串口驱动，处于已连接状态"""
+    # 创建串口驱动实例并模拟依赖组件
+    with patch('serial2mcp.driver.connection_manager.ConnectionManager') as mock_conn_manager, \
+         patch('serial2mcp.driver.reader.BackgroundReader') as mock_reader, \
+         patch('serial2mcp.driver.processor.DataProcessor') as mock_processor:
+        driver = SerialDriver()
+        driver.initialize()
+
+        # 保存模拟对象以便测试使用
+        driver.connection_manager = mock_conn_manager
+        driver.reader = mock_reader
+        driver.processor = mock_processor
+
+    # 模拟连接状态
+    driver._is_connected = True
+    driver.connection_manager.is_connected.return_value = True
+    return driver
@@ -0,0 +1,94 @@
+"""
+数据处理器单元测试
+测试数据处理器的校验和计算功能
+"""
+import pytest
+from serial2mcp.driver import processor
+from serial2mcp.driver.processor import DataProcessor
+from serial2mcp.utils.exceptions import DataParsingError
+
+
+def _reference_crc16(data: bytes) -> int:
+    """逐位计算的参考CRC16实现"""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 0x0001 else crc >> 1
+    return crc
+
+
+class TestDataProcessorChecksum:
+    """数据处理器校验和测试类"""
+
+    def setup_method(self):
+        """测试方法执行前的设置"""
+        self.processor = DataProcessor()
+
+    def test_crc16_check_value(self):
+        """测试CRC16标准校验值（CRC-16/MODBUS）"""
+        assert self.processor.calculate_data_checksum(b"123456789", 'crc16') == "4B37"
+        assert self.processor.calculate_data_checksum(b"", 'crc16') == "FFFF"
+
+    def test_crc16_python_fallback(self, monkeypatch):
+        """测试未安装加速库时的纯Python实现"""
+        monkeypatch.setattr(processor, '_fastcrc16', None)
+        # 覆盖查表法的整8字节块和尾部剩余字节
+        for length in (0, 1, 7, 8, 9, 16, 23, 1027):
+            data = bytes((i * 131 + 7) & 0xFF for i in range(length))
+            expected = f"{_reference_crc16(data):04X}"
+            assert self.processor.calculate_data_checksum(data, 'crc16') == expected
+        assert self.processor.calculate_data_checksum(b"123456789", 'crc16') == "4B37"
+
+    def test_xor_checksum(self):
+        """测试异或校验"""
+        for length in (0, 1, 2, 3, 7, 8, 9, 100, 257):
+            data = bytes((i * 37 + 11) & 0xFF for i in range(length))
+            expected = 0
+            for byte in data:
+                expected ^= byte
+            assert self.processor.calculate_data_checksum(data, 'xor') == f"{expected:02X}"
+
+    def test_validate_checksum(self):
+        """测试校验和验证"""
+        assert self.processor.validate_checksum(b"123456789", "4b37") is True
+        assert self.processor.validate_checksum(b"123456789", "0000") is False
+
+    def test_unsupported_algorithm(self):
+        """测试不支持的校验算法"""
+        with pytest.raises(DataParsingError):
+            self.processor.calculate_data_checksum(b"data", 'md5')
+
+
+class TestDataProcessorReceive:
+    """数据处理器接收数据处理测试类"""
+
+    def setup_method(self):
+        """测试方法执行前的设置"""
+        self.processor = DataProcessor()
+
+    def test_process_received_data(self):
+        """测试文本、非UTF-8数据和空数据的处理结果"""
+        result = self.processor.process_received_data(b"OK\r\n", auto_format=False)
+        assert result.decoded_data == "OK\r\n"
+        assert result.is_hex is False
+        assert result.encoding == 'utf-8'
+        assert result.length == 4
+
+        result = self.processor.process_received_data(b"\xff\xfe")
+        assert result.decoded_data == "fffe"
+        assert result.is_hex is True
+        assert result.encoding == 'hex'
+
+        result = self.processor.process_received_data(b"")
+        assert result._asdict()['decoded_data'] == ''
+
+    def test_detect_data_type(self):
+        """测试数据类型检测，非ASCII数据按解码后的文本判断"""
+        assert self.processor.detect_data_type(b"+CSQ: 20,99\r\n") == 'at_command'
+        assert self.processor.detect_data_type(b"hello world") == 'text'
+        assert self.processor.detect_data_type("0A1B2C") == 'hex'
+        # 无效字节在解码时被忽略，"+:" 不构成AT响应
+        assert self.processor.detect_data_type(b"+\xff:") == 'text'
+        assert self.processor.detect_data_type("+CREG: 1".encode() + b"\xe4\xbd\xa0") == 'at_command'
+        assert self.processor.detect_data_type(b"\x00\x01\x02\xff") == 'binary'
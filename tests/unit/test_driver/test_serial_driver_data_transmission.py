@@ -2,38 +2,46 @@
 串口驱动数据发送接收单元测试
 测试串口驱动的数据发送和接收功能
 """
+import re
 import pytest
+import itertools
 import threading
 import time
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock, ANY
-from serial2mcp.driver.serial_driver import SerialDriver
+from serial2mcp.driver import serial_driver
 from serial2mcp.utils.exceptions import (
     SerialConnectionError,
     SerialDataError,
     TimeoutError as SerialTimeoutError
 )
 
+# 错误信息匹配模式，模块级预编译
+_NOT_CONNECTED = re.compile("串口未连接")
+_STOP_PATTERN_TIMEOUT = re.compile("未找到停止模式")
+
+
+def _use_fake_clock(monkeypatch, *readings):
+    """
+    让驱动模块中的 time.monotonic 依次返回给定读数，读数用完后保持最后一个值，
+    使接收超时无需真实等待
+
+    Args:
+        monkeypatch: pytest monkeypatch 夹具
+        readings: 单调时钟读数序列
+    """
+    clock = itertools.chain(readings, itertools.repeat(readings[-1]))
+    fake_time = SimpleNamespace(monotonic=lambda: next(clock), time=time.time, sleep=time.sleep)
+    monkeypatch.setattr(serial_driver, 'time', fake_time)
+
 
 class TestSerialDriverDataTransmission:
     """串口驱动数据传输测试类"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _setup_driver(self, mocked_driver):
         """测试方法执行前的设置"""
-        # 创建串口驱动实例并模拟依赖组件
-        with patch('serial2mcp.driver.connection_manager.ConnectionManager') as mock_conn_manager, \
-             patch('serial2mcp.driver.reader.BackgroundReader') as mock_reader, \
-             patch('serial2mcp.driver.processor.DataProcessor') as mock_processor:
-            self.driver = SerialDriver()
-            self.driver.initialize()
-
-            # 保存模拟对象以便测试使用
-            self.driver.connection_manager = mock_conn_manager
-            self.driver.reader = mock_reader
-            self.driver.processor = mock_processor
-
-        # 模拟连接状态
-        self.driver._is_connected = True
-        self.driver.connection_manager.is_connected.return_value = True
+        self.driver = mocked_driver
     
     @patch('serial2mcp.driver.connection_manager.ConnectionManager.write')
     def test_send_data_success(self, mock_write):
@@ -55,12 +63,21 @@ class TestSerialDriverDataTransmission:
         
         data = b"hello"
         
-        with pytest.raises(SerialConnectionError):
+        with pytest.raises(SerialConnectionError, match=_NOT_CONNECTED):
             self.driver.send_data(data)
         
         # 验证没有调用写入操作
         mock_write.assert_not_called()
     
+    def test_send_data_write_failure_exits_sync_mode(self):
+        """测试等待响应时写入失败不会滞留在同步模式"""
+        self.driver.connection_manager.write = Mock(side_effect=OSError("write timeout"))
+
+        with pytest.raises(SerialDataError):
+            self.driver.send_data(b"AT\r\n", wait_policy='timeout', timeout=0.01)
+
+        assert self.driver._sync_mode.is_set() is False
+
     def test_send_string(self):
         """测试发送字符串"""
         # 模拟write方法
@@ -71,7 +88,7 @@ class TestSerialDriverDataTransmission:
         
         # 验证字符串被正确编码为字节并发送
         expected_bytes = test_string.encode('utf-8')
-        self.driver.connection_manager.write.assert_called_once_with(expected_bytes)
+        self.driver.connection_manager.write.assert_called_once_with(expected_bytes, drain=False)
     
     def test_enter_exit_sync_mode(self):
         """测试同步模式切换"""
@@ -101,16 +118,18 @@ class TestSerialDriverDataTransmission:
         assert result['data'] == 'response OK'
         assert result['found_stop_pattern'] is True
     
-    def test_receive_sync_timeout(self):
+    def test_receive_sync_timeout(self, monkeypatch):
         """测试同步接收模式 - 超时"""
         # 进入同步模式
         self.driver.enter_sync_mode()
+        # 计算截止时间后时钟立即越过截止时间
+        _use_fake_clock(monkeypatch, 0.0, 1.0)
         
         # 尝试接收数据，但不放入任何数据到队列，期望超时
-        with pytest.raises(SerialTimeoutError):
+        with pytest.raises(SerialTimeoutError, match=_STOP_PATTERN_TIMEOUT):
             self.driver.receive_sync(timeout=0.1, stop_pattern="OK")
     
-    def test_receive_for_timeout(self):
+    def test_receive_for_timeout(self, monkeypatch):
         """测试定时接收模式"""
         # 进入同步模式
         self.driver.enter_sync_mode()
@@ -118,6 +137,8 @@ class TestSerialDriverDataTransmission:
         # 模拟向同步响应队列添加数据
         test_data = b"response data"
         self.driver._sync_response_queue.put(test_data)
+        # 第一次循环取出数据后时钟越过截止时间
+        _use_fake_clock(monkeypatch, 0.0, 0.0, 1.0)
         
         # 按指定时间接收数据
         result = self.driver.receive_for_timeout(duration=0.1)
@@ -146,7 +167,21 @@ class TestSerialDriverDataTransmission:
         assert len(async_messages) == 2
         assert async_messages[0]['raw_data'] == async_data1
         assert async_messages[1]['raw_data'] == async_data2
-    
+
+    def test_get_async_messages_max_items(self):
+        """测试分批获取异步消息"""
+        for i in range(3):
+            self.driver._async_queue.put(f"Async{i}".encode())
+
+        # 只取出前两条，剩余消息保留在队列中
+        async_messages = self.driver.get_async_messages(clear=True, max_items=2)
+        assert [m['raw_data'] for m in async_messages] == [b"Async0", b"Async1"]
+        assert self.driver.get_pending_async_count() == 1
+
+        async_messages = self.driver.get_async_messages(clear=True, max_items=2)
+        assert [m['raw_data'] for m in async_messages] == [b"Async2"]
+        assert self.driver.get_pending_async_count() == 0
+
     def test_get_pending_async_count(self):
         """测试获取待处理异步消息计数"""
         # 添加一些异步消息
@@ -161,8 +196,8 @@ class TestSerialDriverDataTransmission:
         count = self.driver.get_pending_async_count()
         assert count == 0
     
-    @patch('serial2mcp.utils.metrics.metrics_collector')
-    def test_performance_metrics_integration(self, mock_metrics):
+    @patch('serial2mcp.driver.serial_driver.metrics_collector')
+    def test_performance_metrics_integration(self, mock_metrics, monkeypatch):
         """测试性能指标集成"""
         # 发送一些数据
         self.driver.connection_manager.write = Mock(return_value=5)
@@ -174,10 +209,11 @@ class TestSerialDriverDataTransmission:
         
         # 模拟接收数据
         self.driver._sync_response_queue.put(data)
+        _use_fake_clock(monkeypatch, 0.0, 0.0, 1.0)
         self.driver.receive_for_timeout(duration=0.01)
         
-        # 验证接收性能指标被记录
-        mock_metrics.record_receive.assert_called()
+        # 验证接收性能指标被记录（假时钟下恰好收取一次后超时）
+        mock_metrics.record_receive.assert_called_once_with(len(data))
     
     def test_driver_status(self):
         """测试获取驱动状态"""
@@ -0,0 +1,3 @@
+"""
+门面层单元测试初始化文件
+"""
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+参数转换器单元测试
+测试参数转换器编码结果缓存与告警的配合
+"""
+from unittest.mock import Mock
+from serial2mcp.facade.parameter_converter import ParameterConverter
+
+
+class TestParameterConverterEncodeCache:
+    """参数转换器编码缓存测试类"""
+
+    def setup_method(self):
+        """测试方法执行前的设置"""
+        self.converter = ParameterConverter()
+        self.converter.logger = Mock()
+
+    def test_well_formed_payload_is_cached(self):
+        """测试无需告警的载荷被缓存"""
+        assert self.converter.convert_to_bytes("AT\\r\\n") == b"AT\r\n"
+        assert self.converter.convert_to_bytes("01 03 0A", 'hex') == b"\x01\x03\x0a"
+        assert ("01 03 0A", 'hex') in self.converter._encode_cache
+        self.converter.logger.warning.assert_not_called()
+
+    def test_odd_length_hex_warns_on_every_call(self):
+        """测试奇数长度十六进制载荷每次转换都告警"""
+        for _ in range(3):
+            assert self.converter.convert_to_bytes("1AB", 'hex') == b"\x01\xab"
+        assert self.converter.logger.warning.call_count == 3
+        assert ("1AB", 'hex') not in self.converter._encode_cache
@@ -0,0 +1,34 @@
+"""
+异步消息工具单元测试
+测试异步消息读取工具的参数校验
+"""
+import pytest
+from unittest.mock import Mock
+from serial2mcp.driver.serial_driver import SerialDriver
+from serial2mcp.tools.async_message import AsyncMessageTool
+
+
+class TestAsyncMessageTool:
+    """异步消息工具测试类"""
+
+    def setup_method(self):
+        """测试方法执行前的设置"""
+        self.driver = Mock(spec=SerialDriver)
+        self.driver.get_async_messages.return_value = [{'raw_data': b'+CMTI: "SM",1'}]
+        self.driver.get_pending_async_count.return_value = 0
+        self.tool = AsyncMessageTool(self.driver)
+
+    def test_read_async_messages(self):
+        """测试按条数读取异步消息"""
+        result = self.tool.read_async_messages(max_items=1)
+        assert result['success'] is True
+        assert result['count'] == 1
+        self.driver.get_async_messages.assert_called_once_with(clear=True, max_items=1)
+
+    @pytest.mark.parametrize("max_items", [True, False, 0, -1, "2", 1.5])
+    def test_invalid_max_items(self, max_items):
+        """测试无效的 max_items 被拒绝且不会读取队列"""
+        result = self.tool.read_async_messages(max_items=max_items)
+        assert result['success'] is False
+        assert result['error_code'] == 'INVALID_INPUT_ERROR'
+        self.driver.get_async_messages.assert_not_called()
@@ -2,6 +2,7 @@
 性能指标单元测试
 测试性能指标收集器的功能
 """
+import sys
 import time
 import threading
 import pytest
@@ -16,6 +17,14 @@ class TestPerformanceMetrics:
         self.collector = MetricsCollector()
         # 重置指标以确保测试独立性
         self.collector.reset_metrics()
+
+    @pytest.fixture
+    def fast_switching(self):
+        """缩短线程切换间隔，使并发测试中的线程更容易在临界操作之间交错"""
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        yield
+        sys.setswitchinterval(old_interval)
     
     def test_initial_metrics_values(self):
         """测试初始指标值"""
@@ -197,10 +206,13 @@ class TestPerformanceMetrics:
     def test_concurrent_metrics_updates(self):
         """测试并发指标更新"""
         errors = []
+        # 所有线程就绪后同时开始，以增加并发性
+        barrier = threading.Barrier(3)
         
         def update_metrics(thread_id):
             """更新指标的线程函数"""
             try:
+                barrier.wait()
                 for i in range(10):
                     # 执行各种指标更新操作
                     self.collector.record_send(i)
@@ -215,8 +227,6 @@ class TestPerformanceMetrics:
                     # 记录响应时间
                     start = self.collector.start_timer()
                     self.collector.end_timer(start)
-                    
-                    time.sleep(0.001)  # 小延迟以增加并发性
             except Exception as e:
                 errors.append((thread_id, str(e)))
         
@@ -246,17 +256,17 @@ class TestPerformanceMetrics:
         """测试指标收集器的线程安全性"""
         # 多个线程同时访问指标收集器，确保不会出错
         errors = []
+        barrier = threading.Barrier(5)
         
         def access_metrics(thread_id):
             """访问指标的线程函数"""
             try:
+                barrier.wait()
                 for i in range(5):
                     # 同时执行更新和读取操作
                     self.collector.record_send(i)
                     metrics = self.collector.get_metrics()
                     formatted = self.collector.get_formatted_metrics()
-                    
-                    time.sleep(0.001)
             except Exception as e:
                 errors.append((thread_id, str(e)))
         
@@ -283,4 +293,68 @@ class TestPerformanceMetrics:
         
         # 获取指标，验证可以正常获取
         metrics = self.collector.get_metrics()
-        assert 'avg_response_time' in metrics
\ No newline at end of file
+        assert 'avg_response_time' in metrics
+
+    def test_exited_thread_counts_not_double_counted(self, fast_switching):
+        """测试并发读取时已退出线程的计数只被合并一次"""
+        for _ in range(20):
+            self.collector.reset_metrics()
+            writers = [threading.Thread(target=self.collector.record_send, args=(10,)) for _ in range(8)]
+            for w in writers:
+                w.start()
+            for w in writers:
+                w.join()
+
+            seen = []
+            barrier = threading.Barrier(4)
+
+            def read_metrics():
+                barrier.wait()
+                for _ in range(5):
+                    seen.append(self.collector.get_metrics()['bytes_sent'])
+
+            readers = [threading.Thread(target=read_metrics) for _ in range(4)]
+            for r in readers:
+                r.start()
+            for r in readers:
+                r.join()
+
+            # 每次读取都应恰好看到本轮已退出线程记录的全部字节
+            assert set(seen) == {80}
+
+    def test_reset_racing_get_metrics_never_negative(self, fast_switching):
+        """测试重置与读取并发时计数不会出现负值"""
+        stop = threading.Event()
+        negatives = []
+        barrier = threading.Barrier(4)
+
+        def record_sends():
+            barrier.wait()
+            while not stop.is_set():
+                self.collector.record_send(10)
+
+        def reset_loop():
+            barrier.wait()
+            for _ in range(200):
+                self.collector.reset_metrics()
+
+        def read_loop():
+            barrier.wait()
+            for _ in range(200):
+                metrics = self.collector.get_metrics()
+                if metrics['bytes_sent'] < 0 or metrics['send_operations'] < 0:
+                    negatives.append(metrics)
+
+        writer = threading.Thread(target=record_sends)
+        workers = [threading.Thread(target=reset_loop)] + [threading.Thread(target=read_loop) for _ in range(2)]
+        writer.start()
+        try:
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+        finally:
+            stop.set()
+            writer.join()
+
+        assert negatives == []
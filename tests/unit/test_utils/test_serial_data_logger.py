@@ -0,0 +1,75 @@
+"""
+串口数据日志记录器单元测试
+测试后台写日志线程的写入顺序、停止时刷新和队列满时的丢弃与告警
+"""
+import threading
+from unittest.mock import Mock
+from serial2mcp.utils import serial_data_logger
+from serial2mcp.utils.serial_data_logger import SerialDataLogger, SerialDataLoggerManager
+
+_PORT = 'COM9'
+
+
+def _read_entries(log_dir, suffix):
+    """读取日志目录下唯一一个指定后缀的日志文件，返回去掉时间戳的数据行"""
+    paths = list(log_dir.rglob(f"*{suffix}"))
+    assert len(paths) == 1
+    lines = paths[0].read_text(encoding='utf-8').splitlines()
+    # 去掉首尾的 LOG START / LOG END 标记行和行首时间戳
+    return [line.split('] ', 1)[1] for line in lines[1:-1]]
+
+
+class TestSerialDataLoggerManager:
+    """串口数据日志管理器测试类"""
+
+    def setup_method(self):
+        """测试方法执行前的设置"""
+        self.manager = SerialDataLoggerManager()
+
+    def _start(self, log_dir):
+        """为测试串口注册指向临时目录的日志记录器并开始记录"""
+        self.manager.loggers[_PORT] = SerialDataLogger(_PORT, str(log_dir))
+        self.manager.start_logging(_PORT)
+
+    def test_stop_logging_writes_all_entries_in_order(self, tmp_path):
+        """测试停止记录前后台线程写完全部条目且保持顺序"""
+        self._start(tmp_path)
+        entries = [('TX' if i % 2 == 0 else 'RX', f"AT+{i}\r\n".encode()) for i in range(50)]
+        for direction, data in entries:
+            self.manager.log_data(_PORT, direction, data)
+
+        self.manager.stop_logging(_PORT)
+
+        assert _PORT not in self.manager.loggers
+        assert _read_entries(tmp_path, '.txt') == [
+            f"{direction} -> {data.decode()[:-2]}\\r\\n" for direction, data in entries
+        ]
+        assert _read_entries(tmp_path, '.hex') == [
+            f"{direction} -> {data.hex(' ').upper()}" for direction, data in entries
+        ]
+        assert self.manager.dropped == 0
+
+    def test_full_queue_drops_new_entries(self, tmp_path, monkeypatch, capsys):
+        """测试队列满时丢弃新数据并计数，已入队的数据仍被写入"""
+        monkeypatch.setattr(serial_data_logger, '_LOG_QUEUE_SIZE', 4)
+        mock_metrics = Mock()
+        monkeypatch.setattr(serial_data_logger, 'metrics_collector', mock_metrics)
+        self._start(tmp_path)
+        # 占住后台线程位置但不启动，使条目只入队不被取走
+        self.manager._worker = threading.Thread(target=lambda: None)
+
+        for i in range(10):
+            self.manager.log_data(_PORT, 'TX', f"{i}".encode())
+
+        assert self.manager.dropped == 6
+        assert len(self.manager._pending) == 4
+        # 每条被丢弃的数据都计入溢出指标，但同一次溢出只告警一次
+        assert mock_metrics.record_async_overflow.call_count == 6
+        assert capsys.readouterr().err.count("队列已满") == 1
+
+        # 启动后台线程写出已入队的条目
+        self.manager._worker = None
+        self.manager._start_worker()
+        self.manager.stop_logging(_PORT)
+
+        assert _read_entries(tmp_path, '.txt') == [f"TX -> {i}" for i in range(4)]